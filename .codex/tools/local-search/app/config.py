@@ -23,6 +23,9 @@ class Config:
     exclude_globs: list[str]
     redact_enabled: bool
     commit_batch_size: int
+    # Event-driven rescans (needs the optional watchdog package); full scans become a safety net
+    use_fs_events: bool = False
+    full_scan_interval_seconds: int = 3600
 
     @staticmethod
     def load(path: str) -> "Config":
@@ -69,6 +72,8 @@ class Config:
             exclude_globs=list(raw.get("exclude_globs", [])),
             redact_enabled=bool(raw.get("redact_enabled", True)),
             commit_batch_size=int(raw.get("commit_batch_size", 500)),
+            use_fs_events=bool(raw.get("use_fs_events", False)),
+            full_scan_interval_seconds=int(raw.get("full_scan_interval_seconds", 3600)),
         )
 
 
@@ -1,11 +1,22 @@
-import fnmatch
+import base64
+import json
+import os
 import re
 import sqlite3
 import threading
 import time
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Iterable, Optional
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+try:  # Optional: google-re2 gives linear-time matching for user regexes
+    import re2 as _re2  # type: ignore
+except ImportError:
+    _re2 = None
 
 
 @dataclass
@@ -32,9 +43,9 @@ class SearchOptions:
     offset: int = 0
     snippet_lines: int = 5
     # Filtering
-    file_types: list[str] = field(default_factory=list)  # e.g., ["py", "ts"]
+    file_types: Sequence[str] = ()  # e.g., ["py", "ts"]
     path_pattern: Optional[str] = None  # e.g., "src/**/*.ts"
-    exclude_patterns: list[str] = field(default_factory=list)  # e.g., ["node_modules", "build"]
+    exclude_patterns: Sequence[str] = ()  # e.g., ["node_modules", "build"]
     recency_boost: bool = False
     use_regex: bool = False
     case_sensitive: bool = False
@@ -42,12 +53,116 @@ class SearchOptions:
     total_mode: str = "exact"  # "exact" | "approx"
 
 
+_GLOB_CHARS = frozenset("*?[")
+# SQLite < 3.32 caps bound parameters per statement at 999
+_MAX_SQL_PARAMS = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+# sqlite3 binds str/bytes as SQLITE_TRANSIENT, so SQLite holds its own copy of every
+# content value in a statement; cap the content bound per multi-row upsert statement.
+# Counted in characters (len of str), not bytes: SQLite's UTF-8 copy of non-ASCII
+# text can be up to 4x larger.
+_UPSERT_STMT_CHARS = 4 * 1024 * 1024
+# FTS5 highlight() markers; control chars so they never collide with ">>>" in source text
+_HL_OPEN = "\x01"
+_HL_CLOSE = "\x02"
+# Whitespace-delimited query token: outer quotes dropped, an optional short
+# "field:" prefix (<= 10 chars, up to the first colon) split off as group 1.
+_TERM_RE = re.compile(r"""(?<!\S)["']*(?:([^\s:]{0,10}):)?(\S*?)["']*(?!\S)""")
+_FTS_OPERATORS = frozenset({"AND", "OR", "NOT"})
+_SYMBOL_RE = re.compile(r"^\s*(class|def|function|struct|pub\s+fn|async\s+def|interface|type)\s+", re.MULTILINE)
+
+
+def _glob_to_sql(pattern: str) -> str:
+    """Convert an fnmatch-style glob to SQLite GLOB syntax."""
+    # Only the negated character class is spelled differently.
+    return pattern.replace("[!", "[^")
+
+
+@lru_cache(maxsize=512)
+def _compile_path_filters(file_types: tuple[str, ...], path_pattern: Optional[str],
+                          exclude_patterns: tuple[str, ...]) -> tuple[tuple[str, ...], tuple[Any, ...]]:
+    """Translate path filters to SQL clauses + params once per distinct filter set.
+
+    Agents repeat the same file_types/path_pattern/exclude_patterns across many
+    calls, so the translated form is cached for the life of the process.
+    """
+    clauses: list[str] = []
+    params: list[Any] = []
+    
+    if file_types:
+        type_clauses = []
+        for ft in file_types:
+            ext = ft.lower().lstrip(".")
+            type_clauses.append("f.path LIKE ?")
+            params.append(f"%.{ext}")
+        clauses.append("(" + " OR ".join(type_clauses) + ")")
+    
+    if path_pattern:
+        # Same semantics as fnmatch(path, p) or fnmatch(path, "**/" + p)
+        glob = _glob_to_sql(path_pattern)
+        clauses.append("(f.path GLOB ? OR f.path GLOB ?)")
+        params.extend([glob, f"**/{glob}"])
+    
+    for p in exclude_patterns:
+        clauses.append("instr(f.path, ?) = 0")
+        params.append(p)
+        # "*p*" only differs from a plain substring test when p has glob chars
+        if _GLOB_CHARS.intersection(p):
+            clauses.append("f.path NOT GLOB ?")
+            params.append(_glob_to_sql(f"*{p}*"))
+    
+    return tuple(clauses), tuple(params)
+
+
+@lru_cache(maxsize=256)
+def _compile_user_regex(query: str, case_sensitive: bool) -> Any:
+    """Compile a use_regex query once per process; RE2 has no internal compile cache."""
+    if _re2 is not None:
+        try:
+            return _re2.compile(query if case_sensitive else f"(?i){query}")
+        except Exception:
+            # RE2 rejects backreferences/lookarounds; stdlib re handles those.
+            pass
+    return re.compile(query, 0 if case_sensitive else re.IGNORECASE)
+
+
+def _encode_cursor(key: Sequence[Any]) -> str:
+    """Opaque pagination cursor: urlsafe base64 of the JSON-encoded sort key."""
+    raw = json.dumps(list(key), ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, arity: int) -> list[Any]:
+    """Inverse of _encode_cursor; raises ValueError on anything malformed."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(key, list) or len(key) != arity:
+        raise ValueError("Invalid cursor")
+    return key
+
+
+@lru_cache(maxsize=512)
+def _compile_term(term: str) -> re.Pattern:
+    """Case-insensitive literal matcher for one query term, compiled once per process."""
+    return re.compile(re.escape(term), re.IGNORECASE)
+
+
+def _mark_match(m: Any) -> str:
+    """Wrap a match in >>> <<< for snippets; empty (zero-width) matches stay unmarked."""
+    text = m.group(0)
+    return f">>>{text}<<<" if text else ""
+
+
 class LocalSearchDB:
     """SQLite + optional FTS5 backed index.
 
     Design goals:
     - Low IO overhead: batch writes, WAL.
-    - Thread safety: separate read/write connections.
+    - Thread safety: one writer connection, one reader connection per thread.
+      _write_lock serializes writers only (BEGIN..COMMIT on self._write). Readers
+      never take it: under WAL each reader sees the last committed snapshot and
+      is not blocked by an in-flight write transaction.
     - Safer defaults: DB stored under user cache dir by default.
     
     v2.3.1 enhancements:
@@ -62,16 +177,19 @@ class LocalSearchDB:
         self.db_path = db_path
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        # Separate connections: writer (indexer) and reader (HTTP).
+        # Separate connections: one writer (indexer) and one reader per thread,
+        # so concurrent readers (HTTP/MCP) run in parallel under WAL.
         self._write = sqlite3.connect(db_path, check_same_thread=False)
-        self._read = sqlite3.connect(db_path, check_same_thread=False)
         self._write.row_factory = sqlite3.Row
-        self._read.row_factory = sqlite3.Row
+        self._readers = threading.local()
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
 
-        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
 
         self._apply_pragmas(self._write)
-        self._apply_pragmas(self._read)
+        # Keep dirty pages of a bulk upsert in memory until COMMIT
+        self._write.execute("PRAGMA cache_spill=OFF;")
 
         self._fts_enabled = self._try_enable_fts(self._write)
         self._init_schema()
@@ -81,20 +199,86 @@ class LocalSearchDB:
         self._stats_cache_ts = 0.0
         self._stats_cache_ttl = 60.0 # 60 seconds
 
+        # LRU cache for search_v2 results (v2.5.2).
+        # Writes bump _cache_version, which is part of the key, so stale
+        # entries are never hit and simply age out of the LRU.
+        self._search_cache: OrderedDict[tuple, tuple[float, list[SearchHit], dict[str, Any]]] = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        self._search_cache_size = 256
+        self._search_cache_ttl = 60.0
+        self._cache_version = 0
+        # repo_candidates results, same version-keyed invalidation (no TTL needed)
+        self._repo_cand_cache: OrderedDict[tuple, list[dict[str, Any]]] = OrderedDict()
+        self._repo_cand_cache_size = 128
+
+        # Worker pool for regex scans, created on first use (see _search_regex)
+        self._scan_pool: Optional[ThreadPoolExecutor] = None
+        self._scan_pool_lock = threading.Lock()
+
+        # Final SQL text per query shape; identical text lets sqlite3 reuse
+        # its prepared statement instead of re-parsing and re-planning.
+        self._stmt_cache: dict[tuple, str] = {}
+
     @staticmethod
     def _apply_pragmas(conn: sqlite3.Connection) -> None:
+        # page_size only takes effect before the first page is written,
+        # so only apply it to a brand-new database file.
+        if conn.execute("PRAGMA page_count;").fetchone()[0] == 0:
+            conn.execute("PRAGMA page_size=32768;")
         conn.execute("PRAGMA journal_mode=WAL;")
         conn.execute("PRAGMA synchronous=NORMAL;")
         conn.execute("PRAGMA temp_store=MEMORY;")
         conn.execute("PRAGMA busy_timeout=2000;")
-        conn.execute("PRAGMA cache_size=-20000;")
+        conn.execute("PRAGMA cache_size=-131072;")  # 128MB page cache
+        conn.execute("PRAGMA mmap_size=268435456;")  # 256MB memory-mapped reads
+
+    @staticmethod
+    def _apply_reader_pragmas(conn: sqlite3.Connection) -> None:
+        # page_size/journal_mode are persistent file settings owned by the writer;
+        # readers only need their per-connection knobs. Each worker thread gets one
+        # of these, so the page cache is smaller than the writer's; the shared
+        # mmap window serves most reads anyway.
+        conn.execute("PRAGMA query_only=ON;")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+        conn.execute("PRAGMA busy_timeout=2000;")
+        conn.execute("PRAGMA cache_size=-65536;")  # 64MB page cache
+        conn.execute("PRAGMA mmap_size=268435456;")
+
+    def _reader(self) -> sqlite3.Connection:
+        """Return the calling thread's read connection, opening it on first use."""
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            # A larger statement cache keeps every search SQL shape prepared.
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            self._apply_reader_pragmas(conn)
+            self._readers.conn = conn
+            with self._readers_lock:
+                self._reader_conns.append(conn)
+        return conn
 
     @property
     def fts_enabled(self) -> bool:
         return self._fts_enabled
 
+    @property
+    def cache_version(self) -> int:
+        """Bumped on every write; callers caching derived results key on it."""
+        return self._cache_version
+
     def close(self) -> None:
-        for c in (self._read, self._write):
+        if self._scan_pool is not None:
+            self._scan_pool.shutdown(wait=False)
+            self._scan_pool = None
+        # Persist planner statistics for the next run.
+        try:
+            self._write.execute("PRAGMA optimize;")
+        except Exception:
+            pass
+        with self._readers_lock:
+            conns = self._reader_conns + [self._write]
+            self._reader_conns = []
+        for c in conns:
             try:
                 c.close()
             except Exception:
@@ -109,8 +293,11 @@ class LocalSearchDB:
             return False
 
     def _init_schema(self) -> None:
-        with self._lock:
+        with self._write_lock:
             cur = self._write.cursor()
+            # content stays plain TEXT: the external-content FTS5 table reads it
+            # for highlight() and deletes, and the LIKE fallback scans it in SQL.
+            # Ranking queries never select it; only the returned page loads it.
             cur.execute(
                 """
                 CREATE TABLE IF NOT EXISTS files (
@@ -118,10 +305,14 @@ class LocalSearchDB:
                   repo TEXT NOT NULL,
                   mtime INTEGER NOT NULL,
                   size INTEGER NOT NULL,
-                  content TEXT NOT NULL
+                  content TEXT NOT NULL,
+                  content_hash BLOB
                 );
                 """
             )
+            # Indexes created before content_hash existed
+            if "content_hash" not in {r["name"] for r in cur.execute("PRAGMA table_info(files)").fetchall()}:
+                cur.execute("ALTER TABLE files ADD COLUMN content_hash BLOB;")
             
             cur.execute(
                 """
@@ -138,6 +329,25 @@ class LocalSearchDB:
             # Index for efficient filtering
             cur.execute("CREATE INDEX IF NOT EXISTS idx_files_repo ON files(repo);")
             cur.execute("CREATE INDEX IF NOT EXISTS idx_files_mtime ON files(mtime DESC);")
+            # repo filter + recency order (LIKE/regex paths with recency_boost)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_files_repo_mtime ON files(repo, mtime DESC);")
+
+            # Hidden-path flag computed at write time, so list_files can seek on
+            # is_hidden = 0 instead of scanning with leading-wildcard LIKEs.
+            # ALTER TABLE can only add VIRTUAL generated columns; the index stores the value.
+            self._has_hidden_col = False
+            if sqlite3.sqlite_version_info >= (3, 31, 0):
+                cols = {r["name"] for r in cur.execute("PRAGMA table_xinfo(files)").fetchall()}
+                try:
+                    if "is_hidden" not in cols:
+                        cur.execute(
+                            "ALTER TABLE files ADD COLUMN is_hidden INTEGER "
+                            "GENERATED ALWAYS AS (path LIKE '.%' OR path LIKE '%/.%') VIRTUAL;"
+                        )
+                    cur.execute("CREATE INDEX IF NOT EXISTS idx_files_hidden ON files(is_hidden, repo, path);")
+                    self._has_hidden_col = True
+                except sqlite3.OperationalError:
+                    pass
             
             if self._fts_enabled:
                 cur.execute(
@@ -160,9 +370,12 @@ class LocalSearchDB:
                     END;
                     """
                 )
+                # Only re-index FTS when indexed columns change, so touch_files() stays cheap.
+                # Recreated because older indexes have the unconditional AFTER UPDATE form.
+                cur.execute("DROP TRIGGER IF EXISTS files_au;")
                 cur.execute(
                     """
-                    CREATE TRIGGER IF NOT EXISTS files_au AFTER UPDATE ON files BEGIN
+                    CREATE TRIGGER files_au AFTER UPDATE OF path, repo, content ON files BEGIN
                       INSERT INTO files_fts(files_fts, rowid, path, repo, content) VALUES('delete', old.rowid, old.path, old.repo, old.content);
                       INSERT INTO files_fts(rowid, path, repo, content) VALUES (new.rowid, new.path, new.repo, new.content);
                     END;
@@ -170,59 +383,119 @@ class LocalSearchDB:
                 )
             self._write.commit()
 
-    def upsert_files(self, rows: Iterable[tuple[str, str, int, int, str]]) -> int:
-        rows_list = list(rows)
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _upsert_sql(n_rows: int) -> str:
+        values = ",".join(["(?,?,?,?,?,?)"] * n_rows)
+        return f"""
+            INSERT INTO files(path, repo, mtime, size, content, content_hash)
+            VALUES {values}
+            ON CONFLICT(path) DO UPDATE SET
+              repo=excluded.repo,
+              mtime=excluded.mtime,
+              size=excluded.size,
+              content=excluded.content,
+              content_hash=excluded.content_hash;
+        """
+
+    def upsert_files(self, rows: Iterable[tuple]) -> int:
+        """Insert or replace (path, repo, mtime, size, content[, content_hash]) rows."""
+        rows_list = [r if len(r) == 6 else (*r, None) for r in rows]
         if not rows_list:
             return 0
-        with self._lock:
+        # Multi-row VALUES statements amortize parsing/dispatch over many rows;
+        # a statement ends at chunk_rows rows or _UPSERT_STMT_CHARS characters of content.
+        chunk_rows = min(500, _MAX_SQL_PARAMS // 6)
+        # Build statements and flattened params before taking the writer lock
+        batches: list[tuple[str, list[Any]]] = []
+        start = 0
+        content_chars = 0
+        for i, row in enumerate(rows_list):
+            content_chars += len(row[4])
+            n = i + 1 - start
+            if n == chunk_rows or content_chars >= _UPSERT_STMT_CHARS or i == len(rows_list) - 1:
+                batches.append((self._upsert_sql(n), list(chain.from_iterable(rows_list[start:i + 1]))))
+                start = i + 1
+                content_chars = 0
+        with self._write_lock:
             cur = self._write.cursor()
-            cur.execute("BEGIN")
-            cur.executemany(
-                """
-                INSERT INTO files(path, repo, mtime, size, content)
-                VALUES(?,?,?,?,?)
-                ON CONFLICT(path) DO UPDATE SET
-                  repo=excluded.repo,
-                  mtime=excluded.mtime,
-                  size=excluded.size,
-                  content=excluded.content;
-                """,
-                rows_list,
-            )
+            cur.execute("BEGIN IMMEDIATE")
+            for sql, params in batches:
+                cur.execute(sql, params)
             self._write.commit()
+            self._cache_version += 1
+            # Refresh planner stats after bulk loads; optimize only re-ANALYZEs stale tables
+            if len(rows_list) > 1000:
+                self._write.execute("PRAGMA optimize;")
         return len(rows_list)
 
     def delete_files(self, paths: Iterable[str]) -> int:
-        paths_list = list(paths)
-        if not paths_list:
+        params = [(p,) for p in paths]
+        if not params:
             return 0
-        with self._lock:
+        with self._write_lock:
             cur = self._write.cursor()
-            cur.execute("BEGIN")
-            cur.executemany("DELETE FROM files WHERE path=?", [(p,) for p in paths_list])
+            cur.execute("BEGIN IMMEDIATE")
+            cur.executemany("DELETE FROM files WHERE path=?", params)
             self._write.commit()
-        return len(paths_list)
+            self._cache_version += 1
+        return len(params)
 
-    def get_file_meta(self, path: str) -> Optional[tuple[int, int]]:
-        row = self._read.execute("SELECT mtime, size FROM files WHERE path=?", (path,)).fetchone()
+    def touch_files(self, rows: Iterable[tuple[str, int, int]]) -> int:
+        """Update (path, mtime, size) for files whose content is unchanged.
+
+        Does not touch content, so the FTS index is left alone.
+        """
+        params = [(mtime, size, path) for path, mtime, size in rows]
+        if not params:
+            return 0
+        with self._write_lock:
+            cur = self._write.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            cur.executemany("UPDATE files SET mtime=?, size=? WHERE path=?", params)
+            self._write.commit()
+            # mtime feeds recency ranking and result metadata
+            self._cache_version += 1
+        return len(params)
+
+    def get_file_meta(self, path: str) -> Optional[tuple[int, int, Optional[bytes]]]:
+        """(mtime, size, content_hash) of one indexed file; the hash may be None."""
+        row = self._reader().execute("SELECT mtime, size, content_hash FROM files WHERE path=?", (path,)).fetchone()
         if not row:
             return None
-        return int(row["mtime"]), int(row["size"])
+        return int(row["mtime"]), int(row["size"]), row["content_hash"]
+
+    def get_all_file_meta(self) -> dict[str, tuple[int, int, Optional[bytes]]]:
+        """{path: (mtime, size, content_hash)} for every indexed file, in one query.
+
+        Lets a scan compare against the index in-process instead of one
+        get_file_meta() round-trip per file.
+        """
+        rows = self._reader().execute("SELECT path, mtime, size, content_hash FROM files")
+        return {r[0]: (int(r[1]), int(r[2]), r[3]) for r in rows}
 
     def get_index_status(self) -> dict[str, Any]:
         """Get index metadata for debugging/UI (v2.4.2)."""
-        row = self._read.execute("SELECT COUNT(1) AS c, MAX(mtime) AS last_mtime FROM files").fetchone()
+        # DB size comes from the page header in the same query, instead of a stat() call
+        row = self._reader().execute(
+            """
+            SELECT COUNT(1) AS c,
+                   MAX(mtime) AS last_mtime,
+                   (SELECT page_count * page_size FROM pragma_page_count, pragma_page_size) AS db_size
+            FROM files
+            """
+        ).fetchone()
         count = int(row["c"]) if row and row["c"] else 0
         last_mtime = int(row["last_mtime"]) if row and row["last_mtime"] else 0
         
         return {
             "total_files": count,
             "last_scan_time": last_mtime,
-            "db_size_bytes": Path(self.db_path).stat().st_size if Path(self.db_path).exists() else 0
+            "db_size_bytes": int(row["db_size"]) if row and row["db_size"] else 0
         }
 
     def count_files(self) -> int:
-        row = self._read.execute("SELECT COUNT(1) AS c FROM files").fetchone()
+        row = self._reader().execute("SELECT COUNT(1) AS c FROM files").fetchone()
         return int(row["c"]) if row else 0
 
     def clear_stats_cache(self) -> None:
@@ -239,17 +512,31 @@ class LocalSearchDB:
                 return cached
 
         try:
-            rows = self._read.execute("SELECT repo, COUNT(1) as c FROM files GROUP BY repo").fetchall()
+            rows = self._reader().execute("SELECT repo, COUNT(1) as c FROM files GROUP BY repo").fetchall()
             stats = {r["repo"]: r["c"] for r in rows}
             self._stats_cache["repo_stats"] = stats
+            self._stats_cache["scale"] = (sum(stats.values()), len(stats))
             self._stats_cache_ts = now
             return stats
         except Exception:
             return {}
 
+    def get_index_scale(self) -> tuple[int, int]:
+        """(total_files, total_repos), derived from the cached repo stats.
+
+        Lets per-request sizing decisions skip the COUNT(*) in get_index_status;
+        refreshed together with get_repo_stats (TTL, cleared after each scan).
+        """
+        if time.time() - self._stats_cache_ts < self._stats_cache_ttl:
+            scale = self._stats_cache.get("scale")
+            if scale is not None:
+                return scale
+        stats = self.get_repo_stats(force_refresh=True)
+        return sum(stats.values()), len(stats)
+
     def upsert_repo_meta(self, repo_name: str, tags: str = "", domain: str = "", description: str = "", priority: int = 0) -> None:
         """Upsert repository metadata (v2.4.3)."""
-        with self._lock:
+        with self._write_lock:
             self._write.execute(
                 """
                 INSERT OR REPLACE INTO repo_meta (repo_name, tags, domain, description, priority)
@@ -258,15 +545,16 @@ class LocalSearchDB:
                 (repo_name, tags, domain, description, priority)
             )
             self._write.commit()
+            self._cache_version += 1
 
     def get_repo_meta(self, repo_name: str) -> Optional[dict[str, Any]]:
         """Get metadata for a specific repo."""
-        row = self._read.execute("SELECT * FROM repo_meta WHERE repo_name = ?", (repo_name,)).fetchone()
+        row = self._reader().execute("SELECT * FROM repo_meta WHERE repo_name = ?", (repo_name,)).fetchone()
         return dict(row) if row else None
 
     def get_all_repo_meta(self) -> dict[str, dict[str, Any]]:
         """Get all repo metadata as a map."""
-        rows = self._read.execute("SELECT * FROM repo_meta").fetchall()
+        rows = self._reader().execute("SELECT * FROM repo_meta").fetchall()
         return {row["repo_name"]: dict(row) for row in rows}
 
     def list_files(
@@ -277,10 +565,17 @@ class LocalSearchDB:
         include_hidden: bool = False,
         limit: int = 100,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
-        """List indexed files for debugging (v2.4.0)."""
+        """List indexed files for debugging (v2.4.0).
+
+        Pass meta["next_cursor"] back as `cursor` to page by keyset on
+        (repo, path); unlike OFFSET, SQLite seeks straight to the next row
+        instead of walking and discarding every earlier one.
+        """
         limit = min(int(limit), 500)
         offset = max(int(offset), 0)
+        after = _decode_cursor(cursor, 2) if cursor else None
         
         where_clauses = []
         params: list[Any] = []
@@ -290,33 +585,46 @@ class LocalSearchDB:
             params.append(repo)
         
         if not include_hidden:
-            where_clauses.append("f.path NOT LIKE '%/.%'")
-            where_clauses.append("f.path NOT LIKE '.%'")
+            if self._has_hidden_col:
+                where_clauses.append("f.is_hidden = 0")
+            else:
+                where_clauses.append("f.path NOT LIKE '%/.%'")
+                where_clauses.append("f.path NOT LIKE '.%'")
+        
+        path_clauses, path_params = self._path_filter_clauses(file_types, path_pattern, None)
+        where_clauses.extend(path_clauses)
+        params.extend(path_params)
         
         where = " AND ".join(where_clauses) if where_clauses else "1=1"
+        count_params = list(params)
         
+        page_where = where
+        if after is not None:
+            # Cursor supersedes offset
+            page_where += " AND (f.repo, f.path) > (?, ?)"
+            params.extend(after)
+            offset = 0
+        
+        # One extra row tells whether another page exists
         sql = f"""
             SELECT f.repo AS repo,
                    f.path AS path,
                    f.mtime AS mtime,
                    f.size AS size
             FROM files f
-            WHERE {where}
+            WHERE {page_where}
             ORDER BY f.repo, f.path
             LIMIT ? OFFSET ?;
         """
-        params.extend([limit, offset])
+        params.extend([limit + 1, offset])
         
-        rows = self._read.execute(sql, params).fetchall()
+        rows = self._reader().execute(sql, params).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
         
         files: list[dict[str, Any]] = []
         for r in rows:
             path = r["path"]
-            if file_types and not self._matches_file_types(path, file_types):
-                continue
-            if path_pattern and not self._matches_path_pattern(path, path_pattern):
-                continue
-            
             files.append({
                 "repo": r["repo"],
                 "path": path,
@@ -326,8 +634,7 @@ class LocalSearchDB:
             })
         
         count_sql = f"SELECT COUNT(1) AS c FROM files f WHERE {where}"
-        count_params = params[:-2]
-        total = self._read.execute(count_sql, count_params).fetchone()["c"]
+        total = self._reader().execute(count_sql, count_params).fetchone()["c"]
         
         repo_sql = """
             SELECT repo, COUNT(1) AS file_count
@@ -335,7 +642,7 @@ class LocalSearchDB:
             GROUP BY repo
             ORDER BY file_count DESC;
         """
-        repo_rows = self._read.execute(repo_sql).fetchall()
+        repo_rows = self._reader().execute(repo_sql).fetchall()
         repos = [{"repo": r["repo"], "file_count": r["file_count"]} for r in repo_rows]
         
         meta = {
@@ -346,22 +653,34 @@ class LocalSearchDB:
             "repos": repos,
             "include_hidden": include_hidden,
         }
+        if has_more and files:
+            meta["next_cursor"] = _encode_cursor((files[-1]["repo"], files[-1]["path"]))
         
         return files, meta
 
     # ========== Helper Methods ========== 
 
-    def _glob_to_like(self, pattern: str) -> str:
-        """Convert glob-style pattern to SQL LIKE pattern for 1st-pass filtering."""
-        if not pattern:
-            return "%"
-        res = pattern.replace("**", "%").replace("*", "%").replace("?", "_")
-        # Ensure it matches anywhere if not anchored
-        if not (res.startswith("/") or res.startswith("%")):
-            res = "%" + res
-        while "%%" in res:
-            res = res.replace("%%", "%")
-        return res
+    def _prepared(self, shape_key: tuple, builder: Callable[[], str]) -> str:
+        """Memoize the SQL string built for a given query shape."""
+        sql = self._stmt_cache.get(shape_key)
+        if sql is None:
+            if len(self._stmt_cache) >= 512:
+                self._stmt_cache.clear()
+            sql = builder()
+            self._stmt_cache[shape_key] = sql
+        return sql
+
+    def _glob_to_sql(self, pattern: str) -> str:
+        """Convert an fnmatch-style glob to SQLite GLOB syntax."""
+        return _glob_to_sql(pattern)
+
+    def _path_filter_clauses(self, file_types: Optional[Sequence[str]], path_pattern: Optional[str],
+                             exclude_patterns: Optional[Sequence[str]]) -> tuple[list[str], list[Any]]:
+        """Build path-based WHERE clauses so SQLite prunes rows before they reach Python (v2.5.2)."""
+        clauses, params = _compile_path_filters(
+            tuple(file_types or ()), path_pattern or None, tuple(exclude_patterns or ())
+        )
+        return list(clauses), list(params)
 
     def _build_filter_clauses(self, opts: SearchOptions) -> tuple[list[str], list[Any]]:
         """Build SQL WHERE clauses for filtering."""
@@ -371,58 +690,36 @@ class LocalSearchDB:
             clauses.append("f.repo = ?")
             params.append(opts.repo)
         
-        if opts.file_types:
-            type_clauses = []
-            for ft in opts.file_types:
-                ext = ft.lower().lstrip(".")
-                type_clauses.append("f.path LIKE ?")
-                params.append(f"%.{ext}")
-            if type_clauses:
-                clauses.append("(" + " OR ".join(type_clauses) + ")")
-        
-        if opts.path_pattern:
-            clauses.append("f.path LIKE ?")
-            params.append(self._glob_to_like(opts.path_pattern))
-            
+        path_clauses, path_params = self._path_filter_clauses(
+            opts.file_types, opts.path_pattern, opts.exclude_patterns
+        )
+        clauses.extend(path_clauses)
+        params.extend(path_params)
         return clauses, params
 
     def _get_file_extension(self, path: str) -> str:
-        ext = Path(path).suffix
+        # splitext gives the same suffix as Path(path).suffix without building a Path per hit
+        ext = os.path.splitext(path)[1]
         return ext[1:].lower() if ext else ""
     
-    def _matches_file_types(self, path: str, file_types: list[str]) -> bool:
-        if not file_types:
-            return True
-        ext = self._get_file_extension(path)
-        return ext in [ft.lower().lstrip('.') for ft in file_types]
-    
-    def _matches_path_pattern(self, path: str, pattern: Optional[str]) -> bool:
-        if not pattern:
-            return True
-        return fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(path, f"**/{pattern}")
-    
-    def _matches_exclude_patterns(self, path: str, patterns: list[str]) -> bool:
-        if not patterns:
-            return False
-        for p in patterns:
-            if p in path or fnmatch.fnmatch(path, f"*{p}*"):
-                return True
-        return False
-    
-    def _count_matches(self, content: str, query: str, use_regex: bool, case_sensitive: bool) -> int:
-        if use_regex:
-            flags = 0 if case_sensitive else re.IGNORECASE
-            try:
-                return len(re.findall(query, content, flags))
-            except re.error:
-                return 0
-        else:
-            if case_sensitive:
-                return content.count(query)
-            return content.lower().count(query.lower())
+    def _count_matches(self, content: str, query: str, case_sensitive: bool) -> int:
+        """Count literal query occurrences; pass `query` pre-lowered when not case-sensitive."""
+        if case_sensitive:
+            return content.count(query)
+        return content.lower().count(query)
+
+    def _compile_user_regex(self, query: str, case_sensitive: bool) -> Any:
+        """Compile a user regex, preferring RE2 so pathological patterns can't backtrack."""
+        return _compile_user_regex(query, case_sensitive)
+
+    def _term_patterns(self, terms: list[str]) -> list[re.Pattern]:
+        """Term matchers for _snippet_around (shared via the _compile_term LRU)."""
+        return [_compile_term(t) for t in terms if t]
     
-    def _calculate_recency_score(self, mtime: int, base_score: float) -> float:
-        now = time.time()
+    def _calculate_recency_score(self, mtime: int, base_score: float, now: Optional[float] = None) -> float:
+        # Callers scoring many hits pass one `now` for the whole batch
+        if now is None:
+            now = time.time()
         age_days = (now - mtime) / 86400
         if age_days < 1:
             boost = 1.5
@@ -435,52 +732,95 @@ class LocalSearchDB:
         return base_score * boost
 
     def _extract_terms(self, q: str) -> list[str]:
-        raw = [t.strip().strip('"\'') for t in (q or "").split()]
+        # One tokenizer pass; a prefixed token like "repo:AND" keeps its value
         out: list[str] = []
-        for t in raw:
-            if not t or t in {"AND", "OR", "NOT"}:
-                continue
-            if ":" in t and len(t.split(":", 1)[0]) <= 10:
-                t = t.split(":", 1)[1]
-            t = t.strip()
-            if t:
+        for m in _TERM_RE.finditer(q or ""):
+            t = m.group(2)
+            if t and (m.group(1) is not None or t not in _FTS_OPERATORS):
                 out.append(t)
         return out
 
-    def _snippet_around(self, content: str, terms: list[str], max_lines: int, 
-                        highlight: bool = True) -> str:
-        if max_lines <= 0:
-            return ""
-        lines = content.splitlines()
-        if not lines:
+    def _snippet_around(self, content: str, term_patterns: list[re.Pattern], max_lines: int, 
+                        highlight: bool = True, match_pos: Optional[int] = None) -> str:
+        """Build a line-numbered snippet around the first term match.
+
+        Callers that already know where the match is (e.g. the regex scan) pass
+        match_pos, which skips re-searching content; term_patterns[0] is then
+        only used for highlighting.
+        """
+        if max_lines <= 0 or not content:
             return ""
 
-        lower = content.lower()
+        # Case-insensitive search with precompiled patterns; no lowered copy of content
         pos = -1
-        matched_term = ""
-        for t in terms:
-            p = lower.find(t.lower())
-            if p != -1:
-                pos = p
-                matched_term = t
-                break
+        matched: Optional[re.Pattern] = None
+        if match_pos is not None:
+            pos = match_pos
+            matched = term_patterns[0] if term_patterns else None
+        else:
+            for pat in term_patterns:
+                m = pat.search(content)
+                if m:
+                    pos = m.start()
+                    matched = pat
+                    break
 
-        if pos == -1:
-            slice_lines = lines[:max_lines]
-            return "\n".join(f"L{i+1}: {ln}" for i, ln in enumerate(slice_lines))
+        if pos < 0:
+            _, _, lines = self._line_window(content, 0, max_lines)
+            return "\n".join(f"L{i+1}: {ln}" for i, ln in enumerate(lines))
 
-        line_idx = lower[:pos].count("\n")
-        half = max_lines // 2
-        start = max(0, line_idx - half)
-        end = min(len(lines), start + max_lines)
-        start = max(0, end - max_lines)
+        # Only the lines in the window are materialized, not the whole file
+        line_idx, first, lines = self._line_window(content, pos, max_lines)
+        out_lines = []
+        for i, line in enumerate(lines, start=first):
+            if highlight and matched is not None:
+                line = matched.sub(_mark_match, line)
+            prefix = "→" if i == line_idx else " "
+            out_lines.append(f"{prefix}L{i+1}: {line}")
+        return "\n".join(out_lines)
 
+    def _line_window(self, text: str, pos: int, max_lines: int) -> tuple[int, int, list[str]]:
+        """Return (line_idx, first_line_idx, lines) of a max_lines window centred on offset pos.
+
+        Walks newlines outward from pos instead of splitting the whole text.
+        """
+        line_idx = text.count("\n", 0, pos)
+        start = text.rfind("\n", 0, pos) + 1
+        first = line_idx
+        while first > line_idx - max_lines // 2 and start > 0:
+            start = text.rfind("\n", 0, start - 1) + 1
+            first -= 1
+
+        lines: list[str] = []
+        off = start
+        while len(lines) < max_lines and off < len(text):
+            nl = text.find("\n", off)
+            if nl == -1:
+                nl = len(text)
+            lines.append(text[off:nl].rstrip("\r"))
+            off = nl + 1
+
+        # Near EOF: pull earlier lines in so the window stays max_lines tall
+        while len(lines) < max_lines and start > 0:
+            prev = text.rfind("\n", 0, start - 1) + 1
+            lines.insert(0, text[prev:start - 1].rstrip("\r"))
+            start = prev
+            first -= 1
+        return line_idx, first, lines
+
+    def _snippet_from_highlight(self, marked: str, max_lines: int) -> str:
+        """Build a line snippet from FTS5 highlight() output (matches already marked)."""
+        if max_lines <= 0 or not marked:
+            return ""
+        pos = marked.find(_HL_OPEN)
+        if pos == -1:
+            _, _, lines = self._line_window(marked, 0, max_lines)
+            return "\n".join(f"L{i+1}: {ln}" for i, ln in enumerate(lines))
+
+        line_idx, first, lines = self._line_window(marked, pos, max_lines)
         out_lines = []
-        for i in range(start, end):
-            line = lines[i]
-            if highlight and matched_term:
-                pattern = re.compile(re.escape(matched_term), re.IGNORECASE)
-                line = pattern.sub(f">>>{matched_term}<<<", line)
+        for i, line in enumerate(lines, start=first):
+            line = line.replace(_HL_OPEN, ">>>").replace(_HL_CLOSE, "<<<")
             prefix = "→" if i == line_idx else " "
             out_lines.append(f"{prefix}L{i+1}: {line}")
         return "\n".join(out_lines)
@@ -488,7 +828,30 @@ class LocalSearchDB:
     # ========== Main Search Methods ========== 
 
     def search_v2(self, opts: SearchOptions) -> tuple[list[SearchHit], dict[str, Any]]:
-        """Enhanced search with all options (v2.3.1)."""
+        """Enhanced search with all options (v2.3.1), served from an LRU cache (v2.5.2)."""
+        key = (
+            self._cache_version,
+            opts.query, opts.repo, opts.limit, opts.offset, opts.snippet_lines,
+            tuple(opts.file_types), opts.path_pattern, tuple(opts.exclude_patterns),
+            opts.recency_boost, opts.use_regex, opts.case_sensitive, opts.total_mode,
+        )
+        now = time.monotonic()
+        with self._search_cache_lock:
+            cached = self._search_cache.get(key)
+            if cached is not None and now - cached[0] < self._search_cache_ttl:
+                self._search_cache.move_to_end(key)
+                return list(cached[1]), dict(cached[2])
+
+        hits, meta = self._search_v2_uncached(opts)
+
+        with self._search_cache_lock:
+            self._search_cache[key] = (now, hits, meta)
+            self._search_cache.move_to_end(key)
+            while len(self._search_cache) > self._search_cache_size:
+                self._search_cache.popitem(last=False)
+        return list(hits), dict(meta)
+
+    def _search_v2_uncached(self, opts: SearchOptions) -> tuple[list[SearchHit], dict[str, Any]]:
         q = (opts.query or "").strip()
         if not q:
             return [], {"fallback_used": False, "total_scanned": 0, "total": 0}
@@ -520,45 +883,68 @@ class LocalSearchDB:
         
         where = " AND ".join(where_clauses)
         
-        # Total count
-        try:
-            count_sql = f"SELECT COUNT(*) as c FROM files_fts JOIN files f ON f.rowid = files_fts.rowid WHERE {where}"
-            count_row = self._read.execute(count_sql, params).fetchone()
-            total_hits = int(count_row["c"]) if count_row else 0
-        except sqlite3.OperationalError:
-            return None # FTS failed
-            
-        meta["total"] = total_hits
+        # CROSS JOIN pins the join order: the FTS5 MATCH always drives and filters
+        # (repo/path/type) are checked per match via rowid lookup. With a plain
+        # JOIN the planner may start from a selective files index instead and
+        # evaluate MATCH once per row.
+        
+        # Total count (approx mode skips this MATCH pass and uses the fetch size)
+        if opts.total_mode != "approx":
+            try:
+                count_sql = self._prepared(
+                    ("fts_count", where),
+                    lambda: f"SELECT COUNT(*) as c FROM files_fts CROSS JOIN files f ON f.rowid = files_fts.rowid WHERE {where}",
+                )
+                count_row = self._reader().execute(count_sql, params).fetchone()
+                meta["total"] = int(count_row["c"]) if count_row else 0
+            except sqlite3.OperationalError:
+                return None # FTS failed
         meta["total_mode"] = opts.total_mode
 
-        # Fetch buffer to allow for Python-side re-ranking and further filtering (excludes)
+        # Fetch buffer to allow for Python-side re-ranking
         fetch_limit = (opts.offset + opts.limit) * 2
         if fetch_limit < 100: fetch_limit = 100
+
+        # With recency on, prune by bm25 x recency tier in SQL (same tiers as
+        # _calculate_recency_score) so the top-K candidates aren't just the newest files.
+        if opts.recency_boost:
+            order = ("(-bm25(files_fts)) * (CASE WHEN f.mtime > ? THEN 1.5 WHEN f.mtime > ? THEN 1.3 "
+                     "WHEN f.mtime > ? THEN 1.1 ELSE 1.0 END) DESC")
+            now = int(time.time())
+            params.extend([now - 86400, now - 7 * 86400, now - 30 * 86400])
+        else:
+            order = "score"
         
-        sql = f"""
+        sql = self._prepared(("fts_rank", where, opts.recency_boost), lambda: f"""
             SELECT f.repo AS repo,
                    f.path AS path,
                    f.mtime AS mtime,
                    f.size AS size,
-                   bm25(files_fts) AS score,
-                   f.content AS content
+                   f.rowid AS rowid,
+                   bm25(files_fts) AS score
             FROM files_fts
-            JOIN files f ON f.rowid = files_fts.rowid
+            CROSS JOIN files f ON f.rowid = files_fts.rowid
             WHERE {where}
-            ORDER BY {"f.mtime DESC, score" if opts.recency_boost else "score"}, f.path ASC
+            ORDER BY {order}, f.path ASC
             LIMIT ?;
-        """
+        """)
         params.append(int(fetch_limit))
         
-        rows = self._read.execute(sql, params).fetchall()
+        try:
+            rows = self._reader().execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            return None # FTS failed (query syntax), reached here first in approx mode
+        if "total" not in meta:
+            # approx: a short fetch saw every match (exact); a full one is a lower
+            # bound >= 2x the page end, which still keeps has_more correct.
+            meta["total"] = len(rows)
         
-        hits = self._process_rows(rows, opts, terms)
+        ranked = self._rank_candidates(rows, opts, terms)
         meta["total_scanned"] = len(rows)
         
-        # Slice for pagination
-        start = opts.offset
-        end = opts.offset + opts.limit
-        return hits[start:end], meta
+        # Slice for pagination, then pay for content only on the survivors
+        page = ranked[opts.offset:opts.offset + opts.limit]
+        return self._finalize_hits(page, opts, terms, use_fts=True), meta
 
     def _search_like(self, opts: SearchOptions, terms: list[str], 
                      meta: dict[str, Any]) -> tuple[list[SearchHit], dict[str, Any]]:
@@ -574,59 +960,59 @@ class LocalSearchDB:
         
         where = " AND ".join(where_clauses)
         
-        # Total count
-        count_sql = f"SELECT COUNT(*) as c FROM files f WHERE {where}"
-        count_row = self._read.execute(count_sql, params).fetchone()
-        meta["total"] = int(count_row["c"]) if count_row else 0
+        # Total count (a full content scan; approx mode skips it)
+        if opts.total_mode != "approx":
+            count_sql = self._prepared(("like_count", where), lambda: f"SELECT COUNT(*) as c FROM files f WHERE {where}")
+            count_row = self._reader().execute(count_sql, params).fetchone()
+            meta["total"] = int(count_row["c"]) if count_row else 0
         meta["total_mode"] = opts.total_mode
 
         fetch_limit = (opts.offset + opts.limit) * 2
         if fetch_limit < 100: fetch_limit = 100
         
-        sql = f"""
+        sql = self._prepared(("like_rank", where, opts.recency_boost), lambda: f"""
             SELECT f.repo AS repo,
                    f.path AS path,
                    f.mtime AS mtime,
                    f.size AS size,
-                   0.0 AS score,
-                   f.content AS content
+                   f.rowid AS rowid,
+                   0.0 AS score
             FROM files f
             WHERE {where}
             ORDER BY {"f.mtime DESC" if opts.recency_boost else "f.path"}, f.path ASC
             LIMIT ?;
-        """
+        """)
         params.append(int(fetch_limit))
-        rows = self._read.execute(sql, params).fetchall()
+        rows = self._reader().execute(sql, params).fetchall()
+        if "total" not in meta:
+            # approx: a short fetch saw every match (exact); a full one is a lower
+            # bound >= 2x the page end, which still keeps has_more correct.
+            meta["total"] = len(rows)
         
-        hits = self._process_rows(rows, opts, terms)
+        ranked = self._rank_candidates(rows, opts, terms)
         meta["total_scanned"] = len(rows)
         
-        start = opts.offset
-        end = opts.offset + opts.limit
-        return hits[start:end], meta
+        page = ranked[opts.offset:opts.offset + opts.limit]
+        return self._finalize_hits(page, opts, terms), meta
 
     def _search_regex(self, opts: SearchOptions, terms: list[str], 
                       meta: dict[str, Any]) -> tuple[list[SearchHit], dict[str, Any]]:
         meta["regex_mode"] = True
         
-        flags = 0 if opts.case_sensitive else re.IGNORECASE
         try:
-            pattern = re.compile(opts.query, flags)
+            pattern = self._compile_user_regex(opts.query, opts.case_sensitive)
         except re.error as e:
             meta["regex_error"] = str(e)
             return [], meta
         
-        where = "1=1"
-        params: list[Any] = []
-        if opts.repo:
-            where = "f.repo = ?"
-            params.append(opts.repo)
+        filter_clauses, params = self._build_filter_clauses(opts)
+        where = " AND ".join(filter_clauses) if filter_clauses else "1=1"
         
         # Regex scans everything (capped), so "total" is just "found hits" roughly
         # We can't know total without scanning all.
         # We'll just set total = len(hits) found within limit.
         
-        sql = f"""
+        sql = self._prepared(("regex_scan", where, opts.recency_boost), lambda: f"""
             SELECT f.repo AS repo,
                    f.path AS path,
                    f.mtime AS mtime,
@@ -636,79 +1022,85 @@ class LocalSearchDB:
             WHERE {where}
             ORDER BY {"f.mtime DESC" if opts.recency_boost else "f.path"}
             LIMIT 5000;
-        """
-        rows = self._read.execute(sql, params).fetchall()
+        """)
+        rows = self._reader().execute(sql, params).fetchall()
         meta["total_scanned"] = len(rows)
+        now = time.time()
         
-        hits: list[SearchHit] = []
-        for r in rows:
+        def scan_one(r: sqlite3.Row) -> Optional[tuple[SearchHit, str, int]]:
             path = r["path"]
             content = r["content"] or ""
             
-            if not self._matches_file_types(path, opts.file_types):
-                continue
-            if not self._matches_path_pattern(path, opts.path_pattern):
-                continue
-            if self._matches_exclude_patterns(path, opts.exclude_patterns):
-                continue
-            
-            matches = pattern.findall(content)
-            if not matches:
-                continue
+            # Cheap existence check first; most scanned files do not match
+            first = pattern.search(content)
+            if first is None:
+                return None
             
-            match_count = len(matches)
+            # Count without materializing a list of match groups
+            match_count = sum(1 for _ in pattern.finditer(content))
             score = float(match_count)
             if opts.recency_boost:
-                score = self._calculate_recency_score(int(r["mtime"]), score)
+                score = self._calculate_recency_score(int(r["mtime"]), score, now)
             
-            snippet = self._snippet_around(content, [opts.query], opts.snippet_lines, highlight=True)
-            
-            hits.append(SearchHit(
+            return (SearchHit(
                 repo=r["repo"],
                 path=path,
                 score=score,
-                snippet=snippet,
+                snippet="",
                 mtime=int(r["mtime"]),
                 size=int(r["size"]),
                 match_count=match_count,
                 file_type=self._get_file_extension(path),
-            ))
+            ), content, first.start())
+        
+        # Files are independent, but stdlib re holds the GIL while matching;
+        # only RE2 (which releases it) benefits from scanning on threads.
+        if len(rows) >= 256 and not isinstance(pattern, re.Pattern):
+            if self._scan_pool is None:
+                with self._scan_pool_lock:
+                    if self._scan_pool is None:
+                        self._scan_pool = ThreadPoolExecutor(
+                            max_workers=min(8, os.cpu_count() or 4), thread_name_prefix="local-search-regex"
+                        )
+            results = self._scan_pool.map(scan_one, rows)
+        else:
+            results = map(scan_one, rows)
+        matched = [m for m in results if m is not None]
         
         # Sort by score (stable: score DESC, mtime DESC, path ASC)
-        hits.sort(key=lambda h: h.path)
-        hits.sort(key=lambda h: h.mtime, reverse=True)
-        hits.sort(key=lambda h: h.score, reverse=True)
+        matched.sort(key=lambda m: m[0].path)
+        matched.sort(key=lambda m: m[0].mtime, reverse=True)
+        matched.sort(key=lambda m: m[0].score, reverse=True)
         
-        meta["total"] = len(hits) # For regex, total is what we found in the scan
+        meta["total"] = len(matched) # For regex, total is what we found in the scan
         meta["total_mode"] = "approx" # Regex is always approx in this impl
         
-        start = opts.offset
-        end = opts.offset + opts.limit
-        return hits[start:end], meta
-
-    def _process_rows(self, rows: list, opts: SearchOptions, 
-                      terms: list[str]) -> list[SearchHit]:
+        # Snippets only for the page that is actually returned, centred on the
+        # first match found during the scan and highlighted with the user's pattern
+        page = matched[opts.offset:opts.offset + opts.limit]
         hits: list[SearchHit] = []
+        for hit, content, pos in page:
+            hit.snippet = self._snippet_around(content, [pattern], opts.snippet_lines,
+                                               highlight=True, match_pos=pos)
+            hits.append(hit)
+        return hits, meta
+
+    def _rank_candidates(self, rows: list, opts: SearchOptions, 
+                         terms: list[str]) -> list[tuple[int, SearchHit]]:
+        """Cheap first-phase ranking from row metadata only (no file content)."""
+        ranked: list[tuple[int, SearchHit]] = []
         
         all_meta = self.get_all_repo_meta()
         query_terms = [t.lower() for t in terms]
         query_raw_lower = opts.query.lower()
-        symbol_pattern = re.compile(r"^\s*(class|def|function|struct|pub\s+fn|async\s+def|interface|type)\s+", re.MULTILINE)
+        now = time.time()
 
         for r in rows:
             path = r["path"]
             repo_name = r["repo"]
-            content = r["content"] or ""
             mtime = int(r["mtime"])
             size = int(r["size"])
             
-            if not self._matches_file_types(path, opts.file_types):
-                continue
-            if not self._matches_path_pattern(path, opts.path_pattern):
-                continue
-            if self._matches_exclude_patterns(path, opts.exclude_patterns):
-                continue
-            
             base_score = float(r["score"]) if r["score"] is not None else 0.0
             score = -base_score if base_score < 0 else base_score
             reasons = []
@@ -753,28 +1145,80 @@ class LocalSearchDB:
                 reasons.append("Core file")
             
             if opts.recency_boost:
-                score = self._calculate_recency_score(mtime, score)
-            
-            match_count = self._count_matches(content, opts.query, False, opts.case_sensitive)
-            snippet = self._snippet_around(content, terms, opts.snippet_lines, highlight=True)
-            
-            if symbol_pattern.search(snippet):
-                score += 10.0
-                reasons.append("Symbol definition")
+                score = self._calculate_recency_score(mtime, score, now)
 
-            hits.append(SearchHit(
+            ranked.append((int(r["rowid"]), SearchHit(
                 repo=repo_name,
                 path=path,
                 score=round(score, 3),
-                snippet=snippet,
+                snippet="",
                 mtime=mtime,
                 size=size,
-                match_count=match_count,
                 file_type=self._get_file_extension(path),
-                hit_reason=", ".join(reasons) if reasons else "Content match"
-            ))
+                hit_reason=", ".join(reasons),
+            )))
         
         # Sort by score (stable: score DESC, mtime DESC, path ASC)
+        ranked.sort(key=lambda c: c[1].path)
+        ranked.sort(key=lambda c: c[1].mtime, reverse=True)
+        ranked.sort(key=lambda c: c[1].score, reverse=True)
+        return ranked
+
+    def _finalize_hits(self, page: list[tuple[int, SearchHit]], opts: SearchOptions, 
+                       terms: list[str], use_fts: bool = False) -> list[SearchHit]:
+        """Second phase: load content for the page survivors only and build snippets.
+
+        On the FTS path, FTS5 highlight() marks the matched tokens in C, so
+        snippet and match_count come from the marked text without Python-side
+        term scanning.
+        """
+        if not page:
+            return []
+        
+        rowids = [rowid for rowid, _ in page]
+        placeholders = ",".join("?" * len(rowids))
+        texts: dict[int, str] = {}
+        if use_fts:
+            try:
+                sql = self._prepared(("fts_highlight", len(rowids)), lambda: f"""
+                    SELECT rowid, highlight(files_fts, 2, ?, ?) AS marked
+                    FROM files_fts
+                    WHERE files_fts MATCH ? AND rowid IN ({placeholders})
+                """)
+                rows = self._reader().execute(sql, [_HL_OPEN, _HL_CLOSE, opts.query, *rowids]).fetchall()
+                texts = {int(r["rowid"]): r["marked"] or "" for r in rows}
+            except sqlite3.OperationalError:
+                use_fts = False
+        if not use_fts:
+            sql = self._prepared(
+                ("content_by_rowid", len(rowids)),
+                lambda: f"SELECT rowid, content FROM files WHERE rowid IN ({placeholders})",
+            )
+            rows = self._reader().execute(sql, rowids).fetchall()
+            texts = {int(r["rowid"]): r["content"] or "" for r in rows}
+
+        # Per-search invariants, computed once rather than per hit
+        count_query = opts.query if opts.case_sensitive else opts.query.lower()
+        term_patterns = [] if use_fts else self._term_patterns(terms)
+
+        hits: list[SearchHit] = []
+        for rowid, hit in page:
+            text = texts.get(rowid, "")
+            if use_fts:
+                hit.match_count = text.count(_HL_OPEN)
+                hit.snippet = self._snippet_from_highlight(text, opts.snippet_lines)
+            else:
+                hit.match_count = self._count_matches(text, count_query, opts.case_sensitive)
+                hit.snippet = self._snippet_around(text, term_patterns, opts.snippet_lines, highlight=True)
+            
+            reasons = [hit.hit_reason] if hit.hit_reason else []
+            if _SYMBOL_RE.search(hit.snippet):
+                hit.score = round(hit.score + 10.0, 3)
+                reasons.append("Symbol definition")
+            hit.hit_reason = ", ".join(reasons) if reasons else "Content match"
+            hits.append(hit)
+        
+        # Re-order within the page only, so page boundaries stay stable across offsets
         hits.sort(key=lambda h: h.path)
         hits.sort(key=lambda h: h.mtime, reverse=True)
         hits.sort(key=lambda h: h.score, reverse=True)
@@ -802,10 +1246,31 @@ class LocalSearchDB:
 
         limit = max(1, min(int(limit), 5))
 
+        # Agents ask for candidates with the same query repeatedly while narrowing
+        # scope; without FTS each call is a full content scan, so memoize per index version.
+        key = (self._cache_version, q, limit)
+        with self._search_cache_lock:
+            cached = self._repo_cand_cache.get(key)
+            if cached is not None:
+                self._repo_cand_cache.move_to_end(key)
+                return [dict(c) for c in cached]
+
+        out = self._repo_candidates_uncached(q, limit)
+
+        with self._search_cache_lock:
+            self._repo_cand_cache[key] = out
+            while len(self._repo_cand_cache) > self._repo_cand_cache_size:
+                self._repo_cand_cache.popitem(last=False)
+        return [dict(c) for c in out]
+
+    def _repo_candidates_uncached(self, q: str, limit: int) -> list[dict[str, Any]]:
+        # One grouped query picks a sample rowid per repo; evidence for all samples is
+        # then loaded in a single batch instead of running search() once per repo.
         if self._fts_enabled:
             sql = """
                 SELECT f.repo AS repo,
-                       COUNT(1) AS c
+                       COUNT(1) AS c,
+                       MIN(f.rowid) AS sample
                 FROM files_fts
                 JOIN files f ON f.rowid = files_fts.rowid
                 WHERE files_fts MATCH ?
@@ -814,33 +1279,54 @@ class LocalSearchDB:
                 LIMIT ?;
             """
             try:
-                rows = self._read.execute(sql, (q, limit)).fetchall()
+                rows = self._reader().execute(sql, (q, limit)).fetchall()
+                samples = [int(r["sample"]) for r in rows]
+                marked: dict[int, str] = {}
+                if samples:
+                    placeholders = ",".join("?" * len(samples))
+                    ev_rows = self._reader().execute(
+                        f"SELECT rowid, highlight(files_fts, 2, ?, ?) AS marked FROM files_fts "
+                        f"WHERE files_fts MATCH ? AND rowid IN ({placeholders})",
+                        [_HL_OPEN, _HL_CLOSE, q, *samples],
+                    ).fetchall()
+                    marked = {int(e["rowid"]): e["marked"] or "" for e in ev_rows}
                 out: list[dict[str, Any]] = []
                 for r in rows:
-                    repo = str(r["repo"])
-                    c = int(r["c"])
-                    hits, _ = self.search(q=q, repo=repo, limit=1, snippet_max_lines=2)
-                    evidence = hits[0].snippet.replace("\n", " ")[:200] if hits else ""
-                    out.append({"repo": repo, "score": c, "evidence": evidence})
+                    snippet = self._snippet_from_highlight(marked.get(int(r["sample"]), ""), 2)
+                    out.append({
+                        "repo": str(r["repo"]),
+                        "score": int(r["c"]),
+                        "evidence": snippet.replace("\n", " ")[:200],
+                    })
                 return out
             except sqlite3.OperationalError:
                 pass
 
         like_q = q.replace("^", "^^").replace("%", "^%").replace("_", "^_")
         sql = """
-            SELECT repo, COUNT(1) AS c
+            SELECT repo, COUNT(1) AS c, MIN(rowid) AS sample
             FROM files
             WHERE content LIKE ? ESCAPE '^'
             GROUP BY repo
             ORDER BY c DESC
             LIMIT ?;
         """
-        rows = self._read.execute(sql, (f"%{like_q}%", limit)).fetchall()
+        rows = self._reader().execute(sql, (f"%{like_q}%", limit)).fetchall()
+        samples = [int(r["sample"]) for r in rows]
+        contents: dict[int, str] = {}
+        if samples:
+            placeholders = ",".join("?" * len(samples))
+            ev_rows = self._reader().execute(
+                f"SELECT rowid, content FROM files WHERE rowid IN ({placeholders})", samples
+            ).fetchall()
+            contents = {int(e["rowid"]): e["content"] or "" for e in ev_rows}
+        term_patterns = self._term_patterns(self._extract_terms(q))
         out: list[dict[str, Any]] = []
         for r in rows:
-            repo = str(r["repo"])
-            c = int(r["c"])
-            hits, _ = self.search(q=q, repo=repo, limit=1, snippet_max_lines=2)
-            evidence = hits[0].snippet.replace("\n", " ")[:200] if hits else ""
-            out.append({"repo": repo, "score": c, "evidence": evidence})
-        return out
\ No newline at end of file
+            snippet = self._snippet_around(contents.get(int(r["sample"]), ""), term_patterns, 2)
+            out.append({
+                "repo": str(r["repo"]),
+                "score": int(r["c"]),
+                "evidence": snippet.replace("\n", " ")[:200],
+            })
+        return out
@@ -3,6 +3,11 @@ import threading
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from urllib.parse import parse_qs, urlparse
 
+try:  # Optional: faster encoder, same wire format
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 # Support script mode and package mode
 try:
     from .db import LocalSearchDB  # type: ignore
@@ -20,7 +25,10 @@ class Handler(BaseHTTPRequestHandler):
     server_port: int = 47777
 
     def _json(self, obj, status=200):
-        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        if _orjson is not None:
+            body = _orjson.dumps(obj)
+        else:
+            body = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))
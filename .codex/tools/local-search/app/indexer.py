@@ -1,12 +1,26 @@
 import fnmatch
+import hashlib
 import json
 import os
 import re
+import stat
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:  # Optional: faster content hash; blake2b otherwise
+    import xxhash as _xxhash
+except ImportError:
+    _xxhash = None
+
+try:  # Optional: filesystem events for use_fs_events; periodic full scans otherwise
+    from watchdog.observers import Observer as _Observer
+except ImportError:
+    _Observer = None
 
 # Support script mode and package mode
 try:
@@ -31,39 +45,208 @@ class IndexStatus:
     errors: int = 0
 
 
+# Upper bound on threads reading/redacting changed files during a scan
+SCAN_READ_WORKERS = 16
+
+# use_fs_events: quiet period to coalesce an event burst (checkout, build) into one
+# partial scan, and the batch size above which a full scan is cheaper than per-path work
+FS_EVENT_DEBOUNCE_SECONDS = 0.25
+FS_EVENT_MAX_PATHS = 5000
+
+# Flush a scan batch at commit_batch_size files or this many bytes of text,
+# whichever comes first, so a run of large files can't balloon one commit.
+COMMIT_BATCH_BYTES = 16 * 1024 * 1024
+
+
+# Leading indentation is matched atomically ((?=(?P<ws>\s*))(?P=ws)): every rule
+# needs a non-space right after it, so giving back whitespace can never help, but
+# plain \s* would retry the keyword alternation once per indent char on every line.
+_WS = r"(?=(?P<ws>\s*))(?P=ws)"
+
+# Named groups: p = kept prefix, v = redacted value, s = kept suffix (JSON only)
 _REDACT_PATTERNS = [
     # key=value / key: value (line-based assignments)
     re.compile(
-        r"(?im)^(\s*(?:password|passwd|pwd|secret|token|api[_-]?key|access[_-]?key|client[_-]?secret|private[_-]?key|refresh[_-]?token|id[_-]?token|session[_-]?token|aws[_-]?secret[_-]?access[_-]?key)\s*[:=]\s*)(.+?)\s*$"
+        rf"(?im)^(?P<p>{_WS}(?:password|passwd|pwd|secret|token|api[_-]?key|access[_-]?key|client[_-]?secret|private[_-]?key|refresh[_-]?token|id[_-]?token|session[_-]?token|aws[_-]?secret[_-]?access[_-]?key)\s*[:=]\s*)(?P<v>.+?)\s*$"
     ),
     # common spring property style: xxx.password=...
     re.compile(
-        r"(?im)^(\s*[\w\.-]*(?:password|secret|token|api[_-]?key|client[_-]?secret|private[_-]?key|aws[_-]?secret[_-]?access[_-]?key)[\w\.-]*\s*=\s*)(.+?)\s*$"
+        rf"(?im)^(?P<p>{_WS}[\w\.-]*(?:password|secret|token|api[_-]?key|client[_-]?secret|private[_-]?key|aws[_-]?secret[_-]?access[_-]?key)[\w\.-]*\s*=\s*)(?P<v>.+?)\s*$"
     ),
     # JSON style: "password": "..." (or token/apiKey/...)
     re.compile(
-        r"(?im)^(\s*\"(?:password|secret|token|api[_-]?key|client[_-]?secret|private[_-]?key|refresh[_-]?token|id[_-]?token|session[_-]?token|aws[_-]?secret[_-]?access[_-]?key)\"\s*:\s*)\"(.*?)\"(\s*,?\s*)$"
+        rf"(?im)^(?P<p>{_WS}\"(?:password|secret|token|api[_-]?key|client[_-]?secret|private[_-]?key|refresh[_-]?token|id[_-]?token|session[_-]?token|aws[_-]?secret[_-]?access[_-]?key)\"\s*:\s*)\"(?P<v>.*?)\"(?P<s>\s*,?\s*)$"
     ),
     # Authorization header: Authorization: Bearer <token>
-    re.compile(r"(?im)^(\s*authorization\s*:\s*bearer\s+)(.+?)\s*$"),
+    re.compile(rf"(?im)^(?P<p>{_WS}authorization\s*:\s*bearer\s+)(?P<v>.+?)\s*$"),
     # Inline Bearer token patterns (defensive; keep narrow)
-    re.compile(r"(?i)(bearer\s+)[A-Za-z0-9\-\._~\+/]+=*"),
+    re.compile(r"(?i)(?P<p>bearer\s+)[A-Za-z0-9\-\._~\+/]+=*"),
 ]
 
 
+# Every rule above requires one of these substrings (case-insensitively), so a
+# file containing none of them can skip the regex passes entirely.
+_REDACT_NEEDLES = (
+    "passw", "pwd", "secret", "token", "bearer",
+    "apikey", "api_key", "api-key",
+    "accesskey", "access_key", "access-key",
+    "privatekey", "private_key", "private-key",
+)
+
+
+def _mask_value(m: "re.Match") -> str:
+    return f"{m.group('p')}***"
+
+
+def _mask_json_value(m: "re.Match") -> str:
+    # JSON pattern keeps the quotes and trailing comma around the value
+    return f"{m.group('p')}\"***\"{m.group('s')}"
+
+
+# Substitution per rule, decided once at import rather than on every _redact call.
+# Plain callbacks: on Python < 3.12 re expands "\g<p>***" templates in Python code,
+# which is slower than these f-strings.
+_REDACT_RULES = [
+    (pat, _mask_json_value if "s" in pat.groupindex else _mask_value)
+    for pat in _REDACT_PATTERNS
+]
+
+# The Authorization-header and inline Bearer rules can only fire on text that
+# contains "bearer"; files with other keywords (password=, token:) skip them.
+_BEARER_PATTERNS = frozenset(_REDACT_PATTERNS[-2:])
+
+
 def _redact(text: str) -> str:
     # Keep this conservative: only redact obvious assignments.
-    for pat in _REDACT_PATTERNS:
-        # JSON pattern has 3 groups: prefix, value, suffix.
-        if pat.groups == 3:
-            text = pat.sub(lambda m: f"{m.group(1)}\"***\"{m.group(3)}", text)
+    # IGNORECASE also folds a few non-ASCII letters (e.g. U+0131 to "i"), which
+    # lower() doesn't; only trust the substring tests for pure-ASCII text.
+    skip = ()
+    if text.isascii():
+        lowered = text.lower()
+        if not any(n in lowered for n in _REDACT_NEEDLES):
+            return text
+        if "bearer" not in lowered:
+            skip = _BEARER_PATTERNS
+    for pat, repl in _REDACT_RULES:
+        if pat in skip:
             continue
-        # Most patterns: group(1)=prefix, group(2)=value
-        if pat.groups >= 1:
-            text = pat.sub(lambda m: f"{m.group(1)}***", text)
+        text = pat.sub(repl, text)
     return text
 
 
+if _xxhash is not None:
+    def _content_hash(data: bytes) -> bytes:
+        return _xxhash.xxh3_64_digest(data)
+else:
+    def _content_hash(data: bytes) -> bytes:
+        return hashlib.blake2b(data, digest_size=8).digest()
+
+
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+
+
+def _read_small_file(path: Path, size: int) -> bytes:
+    """Read a file whose size is already known from stat(), in open + read + close.
+
+    Path.read_bytes/read_text go through the io stack, which re-stats the fd and
+    seeks before reading; for many small files those extra syscalls dominate.
+    """
+    fd = os.open(path, _OPEN_FLAGS)
+    try:
+        # Ask for one byte more than stat() saw, so a full read means the file grew
+        data = os.read(fd, size + 1)
+        if len(data) > size:
+            chunks = [data]
+            while True:
+                chunk = os.read(fd, 1 << 16)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            data = b"".join(chunks)
+    finally:
+        os.close(fd)
+    return data
+
+
+def _decode_text(data: bytes) -> str:
+    """Decode like Path.read_text(encoding="utf-8", errors="ignore")."""
+    text = data.decode("utf-8", errors="ignore")
+    # Universal newlines, as in text-mode reads. CRLF-only files (the usual case)
+    # need just the first pass; the lone-CR pass would only copy the text again.
+    if "\r" in text:
+        text = text.replace("\r\n", "\n")
+        if "\r" in text:
+            text = text.replace("\r", "\n")
+    return text
+
+
+def _compile_globs(globs) -> Optional[re.Pattern]:
+    """One regex matching any of the fnmatch globs, or None if there are none.
+
+    Match candidates through os.path.normcase, as fnmatch.fnmatch() does.
+    """
+    if not globs:
+        return None
+    return re.compile("|".join(fnmatch.translate(os.path.normcase(g)) for g in globs))
+
+
+def _load_text(path: str, size: int, redact: bool,
+               prev_hash: Optional[bytes]) -> Optional[Tuple[bytes, Optional[str]]]:
+    """Read one file for indexing on the scan's reader threads.
+
+    Returns (content hash, redacted text), with text None when the hash equals
+    prev_hash (content unchanged, nothing to decode or redact); None if the
+    file can't be read.
+    """
+    try:
+        data = _read_small_file(path, size)
+    except Exception:
+        return None
+    digest = _content_hash(data)
+    if digest == prev_hash:
+        return digest, None
+    text = _decode_text(data)
+    return digest, (_redact(text) if redact else text)
+
+
+class _FsEventCollector:
+    """watchdog handler: remembers changed file paths and wakes the indexer.
+
+    Directory creates/moves can bring in files without per-file events, so
+    they ask for a full scan instead.
+    """
+
+    def __init__(self, wake: threading.Event):
+        self._wake = wake
+        self._lock = threading.Lock()
+        self._paths: Set[str] = set()
+        self._full = False
+
+    def dispatch(self, event) -> None:
+        kind = event.event_type
+        if kind not in ("created", "modified", "deleted", "moved", "closed"):
+            return
+        if event.is_directory:
+            # Directory "modified" only means a child changed; that child has its own event
+            if kind not in ("created", "moved"):
+                return
+            with self._lock:
+                self._full = True
+        else:
+            with self._lock:
+                self._paths.add(os.fsdecode(event.src_path))
+                if kind == "moved":
+                    self._paths.add(os.fsdecode(event.dest_path))
+        self._wake.set()
+
+    def drain(self) -> Tuple[Set[str], bool]:
+        """Take (changed paths, full scan needed) collected since the last drain."""
+        with self._lock:
+            paths, full = self._paths, self._full
+            self._paths, self._full = set(), False
+        return paths, full
+
+
 class Indexer:
     def __init__(self, cfg: Config, db: LocalSearchDB, logger=None):
         self.cfg = cfg
@@ -72,7 +255,28 @@ class Indexer:
         self.status = IndexStatus()
         self._stop = threading.Event()
         self._rescan = threading.Event()
+        # Set once the first scan completes, so waiters block instead of polling index_ready
+        self.ready_event = threading.Event()
         self._root_repo_name = "__root__"
+        self._filters_cfg = None
+        self._load_filters()
+        self._full_rescan = False
+        self._fs_events: Optional[_FsEventCollector] = None
+
+    def _load_filters(self) -> None:
+        """Build the file filters from self.cfg once, not per scan or per file.
+
+        Config is frozen, so a different cfg object is the only way the
+        filters can change; scans rebuild them when self.cfg is replaced.
+        """
+        cfg = self.cfg
+        if cfg is self._filters_cfg:
+            return
+        self._include_ext = frozenset(e.lower() for e in (cfg.include_ext or ()))
+        self._include_files = frozenset(cfg.include_files or ())
+        self._exclude_dirs = frozenset(cfg.exclude_dirs or ())
+        self._exclude_re = _compile_globs(getattr(cfg, "exclude_globs", None))
+        self._filters_cfg = cfg
 
     def stop(self) -> None:
         self._stop.set()
@@ -80,22 +284,81 @@ class Indexer:
 
     def request_rescan(self) -> None:
         """Trigger an immediate scan outside the normal interval."""
+        self._full_rescan = True
         self._rescan.set()
 
     def run_forever(self) -> None:
         # first scan ASAP
         self._scan_once()
         self.status.index_ready = True
+        self.ready_event.set()
 
-        while not self._stop.is_set():
-            # Wait for either a rescan request or the interval.
-            self._rescan.wait(timeout=max(1, int(self.cfg.scan_interval_seconds)))
-            self._rescan.clear()
-            if self._stop.is_set():
-                break
-            self._scan_once()
+        # With fs events, the periodic full scan is only a safety net for missed events
+        observer = self._start_fs_watch() if getattr(self.cfg, "use_fs_events", False) else None
+        if observer is not None:
+            interval = max(1, int(getattr(self.cfg, "full_scan_interval_seconds", 3600)))
+        else:
+            interval = max(1, int(self.cfg.scan_interval_seconds))
+        next_full = time.monotonic() + interval
+
+        try:
+            while not self._stop.is_set():
+                # Wait for a rescan request, a file event, or the next full scan.
+                self._rescan.wait(timeout=max(0.0, next_full - time.monotonic()))
+                self._rescan.clear()
+                if self._stop.is_set():
+                    break
+
+                full = self._full_rescan or time.monotonic() >= next_full
+                paths: Set[str] = set()
+                if self._fs_events is not None and not full:
+                    # Let the burst settle; events arriving meanwhile join this pass
+                    if self._stop.wait(FS_EVENT_DEBOUNCE_SECONDS):
+                        break
+                    self._rescan.clear()
+                    paths, full = self._fs_events.drain()
+                    full = full or self._full_rescan or len(paths) > FS_EVENT_MAX_PATHS
+
+                if full:
+                    self._full_rescan = False
+                    if self._fs_events is not None:
+                        self._fs_events.drain()
+                    self._scan_once()
+                    next_full = time.monotonic() + interval
+                elif paths:
+                    self._scan_paths(paths)
+        finally:
+            if observer is not None:
+                try:
+                    observer.stop()
+                    observer.join(timeout=2.0)
+                except Exception:
+                    pass
+
+    def _start_fs_watch(self):
+        """Start a recursive watchdog observer on the workspace; None if unavailable."""
+        if _Observer is None:
+            if self.logger:
+                self.logger.log_info("use_fs_events is set but watchdog is not installed; using periodic scans")
+            return None
+        root = str(Path(os.path.expanduser(self.cfg.workspace_root)).resolve())
+        collector = _FsEventCollector(self._rescan)
+        try:
+            observer = _Observer()
+            observer.daemon = True
+            observer.schedule(collector, root, recursive=True)
+            observer.start()
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error(f"Failed to watch {root}, using periodic scans: {e}")
+            return None
+        self._fs_events = collector
+        if self.logger:
+            self.logger.log_info(f"Watching {root} for file changes")
+        return observer
 
     def _scan_once(self) -> None:
+        self._load_filters()
         root = Path(os.path.expanduser(self.cfg.workspace_root)).resolve()
         
         if self.logger:
@@ -107,27 +370,79 @@ class Indexer:
                 self.logger.log_error(f"Root path does not exist: {root}")
             return
 
-        # 1. Collect all candidate files with stat info for prioritization
+        # 1. Collect all candidate files with stat info for prioritization.
+        # Plain strings from here on; a Path is only built for meta files.
         file_entries = []
-        for file_path in self._iter_files(root):
+        for entry, rel in self._iter_files(root):
             try:
-                st = file_path.stat()
+                # DirEntry caches its stat (free on Windows, one call elsewhere)
+                st = entry.stat()
                 if st.st_size > self.cfg.max_file_bytes:
                     continue
-                file_entries.append((file_path, st))
+                file_entries.append((entry.path, rel, st))
             except Exception as e:
                 if self.logger:
-                    self.logger.log_error(f"Error accessing file {file_path}: {e}")
+                    self.logger.log_error(f"Error accessing file {entry.path}: {e}")
                 continue
         
         if self.logger:
             self.logger.log_info(f"Scan found {len(file_entries)} candidates")
-        
+
+        # One query for all previous (mtime, size) pairs; dropped when the scan ends
+        self._index_entries(file_entries, self.db.get_all_file_meta().get)
+
+    def _scan_paths(self, paths: Iterable[str]) -> None:
+        """Re-index only the given absolute paths (use_fs_events).
+
+        Applies the same filters as a full walk; paths that no longer exist
+        are removed from the index.
+        """
+        self._load_filters()
+        root = str(Path(os.path.expanduser(self.cfg.workspace_root)).resolve())
+        prefix = os.path.join(root, "")
+        file_entries = []
+        deleted = []
+        for path in paths:
+            if not path.startswith(prefix):
+                continue
+            rel = path[len(prefix):]
+            parts = rel.split(os.sep)
+            if any(d in self._exclude_dirs for d in parts[:-1]):
+                continue
+            if not self._wants_file(parts[-1], rel, len(parts) == 1):
+                continue
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                deleted.append(rel)
+                continue
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode) or st.st_size > self.cfg.max_file_bytes:
+                continue
+            file_entries.append((path, rel, st))
+
+        if deleted:
+            try:
+                self.db.delete_files(deleted)
+            except Exception as e:
+                self.status.errors += 1
+                if self.logger:
+                    self.logger.log_error(f"Error removing deleted files: {e}")
+
+        if self.logger:
+            self.logger.log_info(f"Event scan: {len(file_entries)} changed, {len(deleted)} deleted")
+        # A handful of paths: per-file lookups beat loading the whole meta map
+        self._index_entries(file_entries, self.db.get_file_meta)
+
+    def _index_entries(self, file_entries: List[Tuple[str, str, os.stat_result]],
+                       lookup_meta: Callable[[str], Optional[Tuple[int, int, Optional[bytes]]]]) -> None:
+        """Delta-check, read and upsert (path, rel, stat) candidates, then update status."""
         # 2. Prioritize: Recent files first + Core files (v2.5.0)
         now = time.time()
         def sort_key(entry):
-            path, st = entry
-            rel_lower = str(path.relative_to(root)).lower()
+            _, rel, st = entry
+            rel_lower = rel.lower()
             score = st.st_mtime # Base: mtime
             # Priority Boost: Core metadata files
             if any(p in rel_lower for p in ["agents.md", "gemini.md", "service.json", "repo.yaml"]):
@@ -139,65 +454,100 @@ class Indexer:
         # 3. Process files with Smart Delta Scan & AI Safety Net
         scanned = 0
         indexed = 0
-        batch: List[Tuple[str, str, int, int, str]] = []
+        batch: List[Tuple[str, str, int, int, str, bytes]] = []
+        batch_bytes = 0
+        # (path, mtime, size) of files whose stat changed but content hash didn't
+        touched: List[Tuple[str, int, int]] = []
         batch_size = max(50, int(getattr(self.cfg, "commit_batch_size", 500)))
-
-        for file_path, st in file_entries:
+        # 3a. Delta check only (no I/O): which files need (re)indexing
+        changed: List[Tuple[str, str, str, os.stat_result, Optional[bytes]]] = []
+        sep = os.sep
+        root_repo = self._root_repo_name
+        for file_path, rel, st in file_entries:
+            # Let stop() interrupt a long scan; the partial batch is still flushed below
+            if self._stop.is_set():
+                break
             scanned += 1
-            try:
-                rel = str(file_path.relative_to(root))
-                # Repo = 1depth subdirectory; root-level files use a dedicated repo name
-                if os.sep not in rel:
-                    repo = self._root_repo_name
-                else:
-                    repo = rel.split(os.sep, 1)[0]
-                if not repo:
-                    continue
-
-                # Smart Delta Scan: Check mtime & size
-                prev = self.db.get_file_meta(rel)
-                is_changed = True
-                if prev is not None:
-                    prev_mtime, prev_size = prev
-                    # Meta match?
-                    if int(st.st_mtime) == int(prev_mtime) and int(st.st_size) == int(prev_size):
-                        # AI Safety Net: If modified within last 3 seconds, force re-index
-                        if now - st.st_mtime > 3.0:
-                            is_changed = False
-                            # DEBUG: Log skipped file
-                            # if self.logger and scanned % 100 == 0:
-                            #     self.logger.log_info(f"Skipping unchanged file: {rel}")
-                else:
-                    if self.logger:
-                        self.logger.log_info(f"New file detected: {rel}")
-                
-                if not is_changed:
-                    continue
-
-                try:
-                    text = file_path.read_text(encoding="utf-8", errors="ignore")
-                except Exception:
-                    continue
-
-                if getattr(self.cfg, "redact_enabled", True):
-                    text = _redact(text)
-
-                # Process meta files (v2.4.3)
-                fn = file_path.name.lower()
-                if fn in ("service.json", "repo.yaml", "package.json"):
-                    self._process_meta_file(file_path, repo)
-
-                batch.append((rel, repo, int(st.st_mtime), int(st.st_size), text))
-
-                if len(batch) >= batch_size:
-                    self.db.upsert_files(batch)
-                    indexed += len(batch)
-                    batch.clear()
+            # Repo = 1depth subdirectory; root-level files use a dedicated repo name
+            head, found, _ = rel.partition(sep)
+            repo = head if found else root_repo
+            if not repo:
+                continue
 
-            except Exception as e:
-                self.status.errors += 1
+            # Smart Delta Scan: Check mtime & size
+            prev = lookup_meta(rel)
+            is_changed = True
+            if prev is not None:
+                prev_mtime, prev_size, _ = prev
+                # Meta match?
+                if int(st.st_mtime) == int(prev_mtime) and int(st.st_size) == int(prev_size):
+                    # AI Safety Net: If modified within last 3 seconds, force re-index
+                    if now - st.st_mtime > 3.0:
+                        is_changed = False
+                        # DEBUG: Log skipped file
+                        # if self.logger and scanned % 100 == 0:
+                        #     self.logger.log_info(f"Skipping unchanged file: {rel}")
+            else:
                 if self.logger:
-                    self.logger.log_error(f"Error indexing file {file_path}: {e}")
+                    self.logger.log_info(f"New file detected: {rel}")
+
+            if is_changed:
+                # Stored hash rides along so readers can skip unchanged content
+                changed.append((file_path, rel, repo, st, prev[2] if prev is not None else None))
+
+        # 3b. Read + redact on a thread pool, in priority order; DB writes stay on this thread.
+        # At most `window` files are in flight, which bounds the texts held in memory.
+        redact = getattr(self.cfg, "redact_enabled", True)
+        workers = min(SCAN_READ_WORKERS, (os.cpu_count() or 1) * 2)
+        window = workers * 4
+        pending: "deque[tuple]" = deque()
+        todo = iter(changed)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="local-search-read") as pool:
+            def submit_next() -> None:
+                item = next(todo, None)
+                if item is not None:
+                    file_path, _, _, st, prev_hash = item
+                    pending.append((item, pool.submit(_load_text, file_path, st.st_size, redact, prev_hash)))
+
+            for _ in range(window):
+                submit_next()
+
+            while pending:
+                (file_path, rel, repo, st, _), fut = pending.popleft()
+                if self._stop.is_set():
+                    fut.cancel()
+                    for _, f in pending:
+                        f.cancel()
+                    break
+                submit_next()
+                try:
+                    loaded = fut.result()
+                    if loaded is None:
+                        continue
+                    digest, text = loaded
+                    if text is None:
+                        # Touched but identical (checkout, rebase): refresh stat only
+                        touched.append((rel, int(st.st_mtime), int(st.st_size)))
+                        continue
+
+                    # Process meta files (v2.4.3)
+                    fn = os.path.basename(rel).lower()
+                    if fn in ("service.json", "repo.yaml", "package.json"):
+                        self._process_meta_file(file_path, repo)
+
+                    batch.append((rel, repo, int(st.st_mtime), int(st.st_size), text, digest))
+                    batch_bytes += len(text)
+
+                    if len(batch) >= batch_size or batch_bytes >= COMMIT_BATCH_BYTES:
+                        self.db.upsert_files(batch)
+                        indexed += len(batch)
+                        batch.clear()
+                        batch_bytes = 0
+
+                except Exception as e:
+                    self.status.errors += 1
+                    if self.logger:
+                        self.logger.log_error(f"Error indexing file {file_path}: {e}")
 
         if batch:
             try:
@@ -207,6 +557,13 @@ class Indexer:
                 self.status.errors += 1
                 if self.logger:
                     self.logger.log_error(f"Error flushing batch: {e}")
+        if touched:
+            try:
+                self.db.touch_files(touched)
+            except Exception as e:
+                self.status.errors += 1
+                if self.logger:
+                    self.logger.log_error(f"Error updating unchanged files: {e}")
 
         # DEBUG: Log DB Stats
         try:
@@ -225,22 +582,25 @@ class Indexer:
         if self.logger:
             self.logger.log_info(f"Scan complete. Scanned: {scanned}, Indexed: {indexed}, Errors: {self.status.errors}")
 
-    def _process_meta_file(self, file_path: Path, repo: str) -> None:
+    def _process_meta_file(self, file_path: str, repo: str) -> None:
         """Extract metadata from config files (v2.4.3)."""
         tags = []
         domain = ""
         description = ""
         
         try:
-            name = file_path.name.lower()
+            name = os.path.basename(file_path).lower()
+            if name not in ("service.json", "repo.yaml", "package.json"):
+                return
+            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                text = f.read()
             if name == "service.json":
-                data = json.loads(file_path.read_text(encoding="utf-8", errors="ignore"))
+                data = json.loads(text)
                 tags = data.get("tags", [])
                 domain = data.get("domain", "")
                 description = data.get("description", "")
             elif name == "repo.yaml":
                 # Basic line parsing for yaml to avoid dependency
-                text = file_path.read_text(encoding="utf-8", errors="ignore")
                 for line in text.splitlines():
                     if ":" in line:
                         k, v = line.split(":", 1)
@@ -250,7 +610,7 @@ class Indexer:
                         elif k == "tags":
                             tags = [t.strip() for t in v.strip("[]").split(",")]
             elif name == "package.json":
-                data = json.loads(file_path.read_text(encoding="utf-8", errors="ignore"))
+                data = json.loads(text)
                 description = data.get("description", "")
                 if "keywords" in data:
                     tags = data.get("keywords", [])
@@ -261,38 +621,71 @@ class Indexer:
         except Exception:
             pass
 
-    def _iter_files(self, root: Path) -> Iterable[Path]:
-        include_ext = set((self.cfg.include_ext or []))
-        include_files = set((self.cfg.include_files or []))
-        exclude_dirs = set((self.cfg.exclude_dirs or []))
-        exclude_globs = list((getattr(self.cfg, "exclude_globs", []) or []))
-
-        for dirpath, dirnames, filenames in os.walk(root):
-            # prune excluded dirs (in-place)
-            dirnames[:] = [d for d in dirnames if d not in exclude_dirs]
-
-            for fn in filenames:
-                # v2.5.0: Explicitly exclude root-level CLI entry points from index
-                # to prevent __root__ from appearing as a repo candidate.
-                if fn in ("AGENTS.md", "GEMINI.md", "README.md", "install.sh", "uninstall.sh"):
-                    # Only skip if we are strictly at the root
-                    if os.path.samefile(dirpath, root):
-                         continue
-
-                # Fast path filename-only excludes
-                if exclude_globs and any(fnmatch.fnmatch(fn, g) for g in exclude_globs):
-                    continue
+    def _wants_file(self, fn: str, rel: str, at_root: bool) -> bool:
+        """File-level include/exclude rules (directory pruning is the caller's job)."""
+        # v2.5.0: Explicitly exclude root-level CLI entry points from index
+        # to prevent __root__ from appearing as a repo candidate.
+        if at_root and fn in ("AGENTS.md", "GEMINI.md", "README.md", "install.sh", "uninstall.sh"):
+            return False
+
+        # All exclude globs at once, against the filename and the relative path
+        exclude_re = self._exclude_re
+        if exclude_re is not None and (
+            exclude_re.match(os.path.normcase(fn)) or exclude_re.match(os.path.normcase(rel))
+        ):
+            return False
+
+        if fn in self._include_files:
+            return True
+        # Same result as os.path.splitext(fn)[1] without its generic-path overhead;
+        # names like "..py" (only dots before the last one) still go through splitext.
+        dot = fn.rfind(".")
+        if dot <= 0:
+            suf = ""
+        elif fn[dot - 1] != ".":
+            suf = fn[dot:].lower()
+        else:
+            suf = os.path.splitext(fn)[1].lower()
+        return suf in self._include_ext
+
+    def _iter_files(self, root: Path) -> Iterator[Tuple[os.DirEntry, str]]:
+        """Yield (DirEntry, path relative to root) for every file to index.
+
+        Walks with os.scandir directly (same traversal as os.walk: no following
+        of directory symlinks, unreadable directories skipped) so callers can
+        reuse DirEntry.stat() and plain-string paths instead of Path objects.
+        """
+        exclude_dirs = self._exclude_dirs
+        wants_file = self._wants_file
+
+        root_str = str(root)
+        prefix_len = len(os.path.join(root_str, ""))
+        stack = [root_str]
+        while stack:
+            dirpath = stack.pop()
+            at_root = dirpath == root_str
+            try:
+                with os.scandir(dirpath) as it:
+                    entries = list(it)
+            except OSError:
+                continue
 
-                p = Path(dirpath) / fn
-                rel = str(p.relative_to(root))
-                if exclude_globs and any(fnmatch.fnmatch(rel, g) for g in exclude_globs):
+            subdirs = []
+            for entry in entries:
+                fn = entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # prune excluded dirs; like os.walk, don't descend into symlinked dirs
+                    if fn not in exclude_dirs and not entry.is_symlink():
+                        subdirs.append(entry.path)
                     continue
 
-                if include_files and fn in include_files:
-                    yield p
-                    continue
+                rel = entry.path[prefix_len:]
+                if wants_file(fn, rel, at_root):
+                    yield entry, rel
 
-                if include_ext:
-                    suf = p.suffix.lower()
-                    if suf in include_ext:
-                        yield p
+            # Depth-first in listing order, as os.walk visits them
+            stack.extend(reversed(subdirs))
@@ -2,7 +2,6 @@ import json
 import os
 import signal
 import threading
-import time
 import ipaddress
 from pathlib import Path
 from datetime import datetime
@@ -146,8 +145,10 @@ def main() -> int:
     idx_thread.start()
 
     try:
-        while not stop_evt.is_set():
-            time.sleep(0.2)
+        # Wakes as soon as _shutdown sets the event; the timeout only keeps the
+        # main thread returning to the interpreter so signals are delivered on Windows.
+        while not stop_evt.wait(timeout=1.0):
+            pass
     finally:
         _shutdown()
 
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+JSON encoding/decoding for Local Search MCP Server.
+Uses orjson when it is installed and falls back to the stdlib json module.
+"""
+import json
+import os
+from typing import Any, Union
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+# Tool payloads are compact unless LOCAL_SEARCH_PRETTY=1 (indent=2, for reading logs/transcripts)
+PRETTY = os.environ.get("LOCAL_SEARCH_PRETTY") == "1"
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only catch the latter
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse one JSON document from bytes or str."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Compact UTF-8 encoding for JSON-RPC frames on the wire."""
+    if _orjson is not None:
+        return _orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_text(obj: Any) -> str:
+    """Non-ASCII-preserving text for tool result payloads; compact unless PRETTY."""
+    if _orjson is not None:
+        option = _orjson.OPT_NON_STR_KEYS | (_orjson.OPT_INDENT_2 if PRETTY else 0)
+        return _orjson.dumps(obj, option=option).decode("utf-8")
+    if PRETTY:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
@@ -14,14 +14,17 @@ Usage:
 Environment:
   LOCAL_SEARCH_WORKSPACE_ROOT - Workspace root directory (default: cwd)
 """
-import json
+import io
 import os
+import selectors
+import signal
 import sys
 import threading
-import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
 
 # Add parent directories to path for imports
 SCRIPT_DIR = Path(__file__).parent
@@ -35,19 +38,226 @@ from indexer import Indexer
 # Import new modules
 from workspace import WorkspaceManager
 from telemetry import TelemetryLogger
+import jsonio
 import tools.search
 import tools.status
 import tools.repo_candidates
 import tools.list_files
 
 
+# params for requests that omit them (or send null)
+_NO_PARAMS: Mapping[str, Any] = MappingProxyType({})
+
+# Pipe reads return whatever is queued, up to this many bytes per syscall
+STDIN_BUFFER_SIZE = 65536
+# Upper bound on how long run() takes to notice stop() while stdin is idle
+STDIN_POLL_SECONDS = 1.0
+# How long shutdown waits for the indexer thread before closing the DB anyway
+INDEXER_JOIN_TIMEOUT = 2.0
+# tools/call requests run on this many worker threads; sqlite3 releases the
+# GIL while a query runs, so a slow search doesn't hold up ping/tools/list.
+TOOL_WORKERS = 4
+
+
+# tools/list response (v2.5.0 enhanced schema). Static, so it is built once at
+# import and the same object is returned for every request; treat as read-only.
+# Sequences are tuples so they can't be mutated in place; both json and orjson
+# encode them as arrays. (MappingProxyType would freeze the dicts too, but
+# neither encoder can serialize it.)
+_TOOLS_LIST_RESPONSE: Dict[str, Any] = {
+    "tools": (
+        {
+            "name": "search",
+            "description": "Enhanced search for code/files with pagination. Use BEFORE file exploration to save tokens.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Search query (keywords, function names, regex)",
+                    },
+                    "repo": {
+                        "type": "string",
+                        "description": "Limit search to specific repository",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum results (default: 10, max: 50)",
+                        "default": 10,
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Pagination offset (default: 0)",
+                        "default": 0,
+                    },
+                    "file_types": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Filter by file extensions, e.g., ['py', 'ts']",
+                    },
+                    "path_pattern": {
+                        "type": "string",
+                        "description": "Glob pattern for path matching, e.g., 'src/**/*.ts'",
+                    },
+                    "exclude_patterns": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Patterns to exclude, e.g., ['node_modules']",
+                    },
+                    "recency_boost": {
+                        "type": "boolean",
+                        "description": "Boost recently modified files (default: false)",
+                        "default": False,
+                    },
+                    "use_regex": {
+                        "type": "boolean",
+                        "description": "Treat query as regex pattern (default: false)",
+                        "default": False,
+                    },
+                    "case_sensitive": {
+                        "type": "boolean",
+                        "description": "Case-sensitive search (default: false)",
+                        "default": False,
+                    },
+                    "context_lines": {
+                        "type": "integer",
+                        "description": "Number of context lines in snippet (default: 5)",
+                        "default": 5,
+                     },
+                    "scope": {
+                        "type": "string",
+                        "description": "Alias for 'repo'",
+                    },
+                    "type": {
+                        "type": "string",
+                        "enum": ("docs", "code"),
+                        "description": "Filter by type: 'docs' or 'code'",
+                    },
+                 },
+                "required": ("query",),
+            },
+        },
+        {
+            "name": "status",
+            "description": "Get indexer status. Use details=true for per-repo stats.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "details": {
+                        "type": "boolean",
+                        "description": "Include detailed repo stats (default: false)",
+                        "default": False,
+                    }
+                },
+            },
+        },
+        {
+            "name": "repo_candidates",
+            "description": "Find candidate repositories for a query.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Query to find relevant repositories",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum candidates (default: 3)",
+                        "default": 3,
+                    },
+                },
+                "required": ("query",),
+            },
+        },
+        {
+            "name": "list_files",
+            "description": "List indexed files for debugging.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "repo": {
+                        "type": "string",
+                        "description": "Filter by repository name",
+                    },
+                    "path_pattern": {
+                        "type": "string",
+                        "description": "Glob pattern for path matching",
+                    },
+                    "file_types": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Filter by file extensions",
+                    },
+                    "include_hidden": {
+                        "type": "boolean",
+                        "description": "Include hidden directories (default: false)",
+                        "default": False,
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum results (default: 100)",
+                        "default": 100,
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Pagination offset (default: 0). Deprecated: prefer cursor",
+                        "default": 0,
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "meta.next_cursor from the previous page; overrides offset",
+                    },
+                },
+            },
+        },
+    ),
+}
+
+
+# Serialized once: run() splices the request id in front instead of re-encoding
+# the whole schema on every tools/list call.
+_TOOLS_LIST_RESULT_JSON = jsonio.dumps_bytes(_TOOLS_LIST_RESPONSE)
+
+
 class LocalSearchMCPServer:
     """MCP Server for Local Search - STDIO mode."""
     
+    # Fixed attribute set: slot access on the per-request path, no instance __dict__
+    __slots__ = (
+        "workspace_root",
+        "cfg",
+        "db",
+        "indexer",
+        "_indexer_thread",
+        "_initialized",
+        "_init_lock",
+        "_stop_event",
+        "_methods",
+        "_notifications",
+        "_tools",
+        "_search_cache",
+        "_status_static",
+        "_write_lock",
+        "logger",
+    )
+    
     PROTOCOL_VERSION = "2025-11-25"
     SERVER_NAME = "local-search"
     SERVER_VERSION = "2.5.0"  # DB Isolation & Pagination
     
+    # initialize result is static per process; built once, treat as read-only
+    _INIT_RESULT: Dict[str, Any] = {
+        "protocolVersion": PROTOCOL_VERSION,
+        "serverInfo": {
+            "name": SERVER_NAME,
+            "version": SERVER_VERSION,
+        },
+        "capabilities": {
+            "tools": {},
+        },
+    }
+    
     def __init__(self, workspace_root: str):
         self.workspace_root = workspace_root
         self.cfg: Optional[Config] = None
@@ -55,6 +265,32 @@ class LocalSearchMCPServer:
         self.indexer: Optional[Indexer] = None
         self._indexer_thread: Optional[threading.Thread] = None
         self._initialized = False
+        self._init_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        # LRU of rendered search payloads (see tools.search.execute_search)
+        self._search_cache: "OrderedDict[tuple, tuple[float, str]]" = OrderedDict()
+        # Init-time part of the status tool payload (see tools.status.build_status_static)
+        self._status_static: Optional[Dict[str, Any]] = None
+        # Keeps frames from concurrent tool workers whole on stdout
+        self._write_lock = threading.Lock()
+        
+        # JSON-RPC dispatch tables: one dict probe per request instead of an elif chain.
+        # Notifications never produce a response, even when sent with an id.
+        self._methods: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "initialize": self.handle_initialize,
+            "tools/list": self.handle_tools_list,
+            "tools/call": self.handle_tools_call,
+            "ping": self.handle_ping,
+        }
+        self._notifications: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            "initialized": self.handle_initialized,
+        }
+        self._tools: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "search": self._tool_search,
+            "status": self._tool_status,
+            "repo_candidates": self._tool_repo_candidates,
+            "list_files": self._tool_list_files,
+        }
         
         # Initialize telemetry logger
         self.logger = TelemetryLogger(WorkspaceManager.get_global_log_dir())
@@ -64,57 +300,64 @@ class LocalSearchMCPServer:
         if self._initialized:
             return
         
-        try:
-            os.environ["LOCAL_SEARCH_WORKSPACE_ROOT"] = self.workspace_root
+        # Double-checked: the fast path is one attribute read; only the first
+        # caller(s) take the lock and the slow setup runs exactly once.
+        with self._init_lock:
+            if self._initialized:
+                return
+            try:
+                os.environ["LOCAL_SEARCH_WORKSPACE_ROOT"] = self.workspace_root
             
-            config_path = Path(self.workspace_root) / ".codex" / "tools" / "local-search" / "config" / "config.json"
-            if config_path.exists():
-                self.cfg = Config.load(str(config_path))
-            else:
-                self.cfg = Config(
-                    workspace_root=self.workspace_root,
-                    server_host="127.0.0.1",
-                    server_port=47777,
-                    scan_interval_seconds=180,
-                    snippet_max_lines=5,
-                    max_file_bytes=800000,
-                    db_path=str(WorkspaceManager.get_global_db_path()),
-                    include_ext=[".py", ".js", ".ts", ".java", ".kt", ".go", ".rs", ".md", ".json", ".yaml", ".yml", ".sh"],
-                    include_files=["pom.xml", "package.json", "Dockerfile", "Makefile", "build.gradle", "settings.gradle"],
-                    exclude_dirs=[".git", "node_modules", "__pycache__", ".venv", "venv", "target", "build", "dist", "coverage", "vendor"],
-                    exclude_globs=["*.min.js", "*.min.css", "*.map", "*.lock", "package-lock.json", "yarn.lock", "pnpm-lock.yaml"],
-                    redact_enabled=True,
-                    commit_batch_size=500,
-                )
+                # Plain string paths, resolved once; no PosixPath chain per component
+                config_path = os.path.join(self.workspace_root, ".codex", "tools", "local-search", "config", "config.json")
+                global_db_path = str(WorkspaceManager.get_global_db_path())
+                if os.path.exists(config_path):
+                    self.cfg = Config.load(config_path)
+                else:
+                    self.cfg = Config(
+                        workspace_root=self.workspace_root,
+                        server_host="127.0.0.1",
+                        server_port=47777,
+                        scan_interval_seconds=180,
+                        snippet_max_lines=5,
+                        max_file_bytes=800000,
+                        db_path=global_db_path,
+                        include_ext=[".py", ".js", ".ts", ".java", ".kt", ".go", ".rs", ".md", ".json", ".yaml", ".yml", ".sh"],
+                        include_files=["pom.xml", "package.json", "Dockerfile", "Makefile", "build.gradle", "settings.gradle"],
+                        exclude_dirs=[".git", "node_modules", "__pycache__", ".venv", "venv", "target", "build", "dist", "coverage", "vendor"],
+                        exclude_globs=["*.min.js", "*.min.css", "*.map", "*.lock", "package-lock.json", "yarn.lock", "pnpm-lock.yaml"],
+                        redact_enabled=True,
+                        commit_batch_size=500,
+                    )
             
-            debug_db_path = os.environ.get("LOCAL_SEARCH_DB_PATH", "").strip()
-            if debug_db_path:
-                self.logger.log_info(f"Using debug DB path override: {debug_db_path}")
-                db_path = Path(os.path.expanduser(debug_db_path))
-            else:
-                db_path = WorkspaceManager.get_global_db_path()
+                debug_db_path = os.environ.get("LOCAL_SEARCH_DB_PATH", "").strip()
+                if debug_db_path:
+                    self.logger.log_info(f"Using debug DB path override: {debug_db_path}")
+                    db_path = os.path.expanduser(debug_db_path)
+                else:
+                    db_path = global_db_path
             
-            db_path.parent.mkdir(parents=True, exist_ok=True)
-            self.db = LocalSearchDB(str(db_path))
-            self.logger.log_info(f"DB path: {db_path}")
+                # LocalSearchDB creates the parent directory itself
+                self.db = LocalSearchDB(db_path)
+                self._search_cache.clear()
+                self.logger.log_info(f"DB path: {db_path}")
             
-            self.indexer = Indexer(self.cfg, self.db, self.logger)
+                self.indexer = Indexer(self.cfg, self.db, self.logger)
+                self._status_static = tools.status.build_status_static(
+                    self.db, self.cfg, self.workspace_root, self.SERVER_VERSION
+                )
             
-            self._indexer_thread = threading.Thread(target=self.indexer.run_forever, daemon=True)
-            self._indexer_thread.start()
+                self._indexer_thread = threading.Thread(target=self.indexer.run_forever, daemon=True)
+                self._indexer_thread.start()
             
-            init_timeout = float(os.environ.get("LOCAL_SEARCH_INIT_TIMEOUT", "5"))
-            if init_timeout > 0:
-                wait_iterations = int(init_timeout * 10)
-                for _ in range(wait_iterations):
-                    if self.indexer.status.index_ready:
-                        break
-                    time.sleep(0.1)
+                init_timeout = float(os.environ.get("LOCAL_SEARCH_INIT_TIMEOUT", "5"))
+                if init_timeout > 0:
+                    self.indexer.ready_event.wait(timeout=init_timeout)
             
-            self._initialized = True
-        except Exception as e:
-            self.logger.log_error(f"Initialization failed: {e}")
-            raise
+                self._initialized = True
+            except Exception as e:
+                self.logger.log_error(f"Initialization failed: {e}")
+                raise
     
     
     def handle_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -132,167 +375,17 @@ class LocalSearchMCPServer:
                 self._initialized = False  # Force re-initialization with new workspace
                 self.logger.log_info(f"Workspace set from rootUri: {self.workspace_root}")
         
-        return {
-            "protocolVersion": self.PROTOCOL_VERSION,
-            "serverInfo": {
-                "name": self.SERVER_NAME,
-                "version": self.SERVER_VERSION,
-            },
-            "capabilities": {
-                "tools": {},
-            },
-        }
+        return self._INIT_RESULT
     
     def handle_initialized(self, params: Dict[str, Any]) -> None:
         self._ensure_initialized()
     
+    def handle_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {}
+    
     def handle_tools_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle tools/list request - v2.5.0 enhanced schema."""
-        return {
-            "tools": [
-                {
-                    "name": "search",
-                    "description": "Enhanced search for code/files with pagination. Use BEFORE file exploration to save tokens.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Search query (keywords, function names, regex)",
-                            },
-                            "repo": {
-                                "type": "string",
-                                "description": "Limit search to specific repository",
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum results (default: 10, max: 50)",
-                                "default": 10,
-                            },
-                            "offset": {
-                                "type": "integer",
-                                "description": "Pagination offset (default: 0)",
-                                "default": 0,
-                            },
-                            "file_types": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "Filter by file extensions, e.g., ['py', 'ts']",
-                            },
-                            "path_pattern": {
-                                "type": "string",
-                                "description": "Glob pattern for path matching, e.g., 'src/**/*.ts'",
-                            },
-                            "exclude_patterns": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "Patterns to exclude, e.g., ['node_modules']",
-                            },
-                            "recency_boost": {
-                                "type": "boolean",
-                                "description": "Boost recently modified files (default: false)",
-                                "default": False,
-                            },
-                            "use_regex": {
-                                "type": "boolean",
-                                "description": "Treat query as regex pattern (default: false)",
-                                "default": False,
-                            },
-                            "case_sensitive": {
-                                "type": "boolean",
-                                "description": "Case-sensitive search (default: false)",
-                                "default": False,
-                            },
-                            "context_lines": {
-                                "type": "integer",
-                                "description": "Number of context lines in snippet (default: 5)",
-                                "default": 5,
-                             },
-                            "scope": {
-                                "type": "string",
-                                "description": "Alias for 'repo'",
-                            },
-                            "type": {
-                                "type": "string",
-                                "enum": ["docs", "code"],
-                                "description": "Filter by type: 'docs' or 'code'",
-                            },
-                         },
-                        "required": ["query"],
-                    },
-                },
-                {
-                    "name": "status",
-                    "description": "Get indexer status. Use details=true for per-repo stats.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "details": {
-                                "type": "boolean",
-                                "description": "Include detailed repo stats (default: false)",
-                                "default": False,
-                            }
-                        },
-                    },
-                },
-                {
-                    "name": "repo_candidates",
-                    "description": "Find candidate repositories for a query.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Query to find relevant repositories",
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum candidates (default: 3)",
-                                "default": 3,
-                            },
-                        },
-                        "required": ["query"],
-                    },
-                },
-                {
-                    "name": "list_files",
-                    "description": "List indexed files for debugging.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "repo": {
-                                "type": "string",
-                                "description": "Filter by repository name",
-                            },
-                            "path_pattern": {
-                                "type": "string",
-                                "description": "Glob pattern for path matching",
-                            },
-                            "file_types": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "Filter by file extensions",
-                            },
-                            "include_hidden": {
-                                "type": "boolean",
-                                "description": "Include hidden directories (default: false)",
-                                "default": False,
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum results (default: 100)",
-                                "default": 100,
-                            },
-                            "offset": {
-                                "type": "integer",
-                                "description": "Pagination offset (default: 0)",
-                                "default": 0,
-                            },
-                        },
-                    },
-                },
-            ],
-        }
+        return _TOOLS_LIST_RESPONSE
     
     def handle_tools_call(self, params: Dict[str, Any]) -> Dict[str, Any]:
         self._ensure_initialized()
@@ -300,23 +393,18 @@ class LocalSearchMCPServer:
         tool_name = params.get("name")
         args = params.get("arguments", {})
         
-        if tool_name == "search":
-            return self._tool_search(args)
-        elif tool_name == "status":
-            return self._tool_status(args)
-        elif tool_name == "repo_candidates":
-            return self._tool_repo_candidates(args)
-        elif tool_name == "list_files":
-            return self._tool_list_files(args)
-        else:
+        tool = self._tools.get(tool_name) if isinstance(tool_name, str) else None
+        if tool is None:
             raise ValueError(f"Unknown tool: {tool_name}")
+        return tool(args)
     
     def _tool_search(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Execute enhanced search tool (v2.5.0)."""
-        return tools.search.execute_search(args, self.db, self.logger)
+        return tools.search.execute_search(args, self.db, self.logger, cache=self._search_cache)
     
     def _tool_status(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        return tools.status.execute_status(args, self.indexer, self.db, self.cfg, self.workspace_root, self.SERVER_VERSION)
+        return tools.status.execute_status(args, self.indexer, self.db, self.cfg, self.workspace_root, self.SERVER_VERSION,
+                                           static=self._status_static)
     
     def _tool_repo_candidates(self, args: Dict[str, Any]) -> Dict[str, Any]:
         return tools.repo_candidates.execute_repo_candidates(args, self.db)
@@ -325,36 +413,48 @@ class LocalSearchMCPServer:
         return tools.list_files.execute_list_files(args, self.db, self.logger)
     
     def handle_request(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # A frame that parses but isn't an object (array, number, ...) would
+        # otherwise raise AttributeError out of the read loop.
+        if not isinstance(request, dict):
+            return {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {
+                    "code": -32600,
+                    "message": "Invalid Request",
+                },
+            }
+        
         method = request.get("method")
-        params = request.get("params", {})
+        # Shared read-only default instead of a fresh {} per request
+        params = request.get("params") or _NO_PARAMS
         msg_id = request.get("id")
         
         is_notification = msg_id is None
+        if not isinstance(method, str):
+            method = str(method)
+        
+        # Resolve the handler up front; unknown methods never enter the try block
+        notify = self._notifications.get(method)
+        handler = self._methods.get(method) if notify is None else None
+        if notify is None and handler is None:
+            if is_notification:
+                return None
+            return {
+                "jsonrpc": "2.0",
+                "id": msg_id,
+                "error": {
+                    "code": -32601,
+                    "message": f"Method not found: {method}",
+                },
+            }
         
         try:
-            if method == "initialize":
-                result = self.handle_initialize(params)
-            elif method == "initialized":
-                self.handle_initialized(params)
+            if notify is not None:
+                notify(params)
                 return None
-            elif method == "tools/list":
-                result = self.handle_tools_list(params)
-            elif method == "tools/call":
-                result = self.handle_tools_call(params)
-            elif method == "ping":
-                result = {}
-            else:
-                if is_notification:
-                    return None
-                return {
-                    "jsonrpc": "2.0",
-                    "id": msg_id,
-                    "error": {
-                        "code": -32601,
-                        "message": f"Method not found: {method}",
-                    },
-                }
             
+            result = handler(params)
             if is_notification:
                 return None
             
@@ -376,22 +476,131 @@ class LocalSearchMCPServer:
                 },
             }
     
+    def _write_message(self, message: Dict[str, Any]) -> None:
+        """Write one JSON-RPC message as a single UTF-8 line.
+
+        The frame and its newline go out in one os.write() on the stdout fd,
+        skipping the TextIO/BufferedWriter layers and the separate flush.
+        """
+        self._write_frame(jsonio.dumps_bytes(message) + b"\n")
+    
+    def _write_frame(self, frame: bytes) -> None:
+        """Write pre-encoded frame bytes (newline included) to stdout."""
+        with self._write_lock:
+            try:
+                fd = sys.stdout.fileno()
+            except (AttributeError, ValueError, io.UnsupportedOperation):
+                # stdout replaced by a non-file object (e.g. captured in tests)
+                sys.stdout.write(frame.decode("utf-8"))
+                sys.stdout.flush()
+                return
+            view = memoryview(frame)
+            while view:
+                view = view[os.write(fd, view):]
+    
+    def _respond(self, request: Dict[str, Any]) -> None:
+        """Handle one request and write its response (tool worker entry point)."""
+        try:
+            response = self.handle_request(request)
+            if response is not None:
+                self._write_message(response)
+        except Exception as e:
+            self.logger.log_error(f"Error writing response: {e}")
+    
+    @staticmethod
+    def _open_stdin() -> io.BufferedReader:
+        """Binary stdin with a large buffer, so one read() drains a burst of queued frames."""
+        raw = getattr(sys.stdin.buffer, "raw", None)
+        if raw is None:
+            return sys.stdin.buffer
+        return io.BufferedReader(raw, buffer_size=STDIN_BUFFER_SIZE)
+    
+    def _iter_stdin_frames(self) -> Iterator[bytes]:
+        """Yield newline-delimited frames from stdin until EOF or stop().
+
+        Waits on a selector with a timeout so a stop request (SIGTERM) is seen
+        within STDIN_POLL_SECONDS even while no input arrives. Falls back to
+        plain blocking readline() when stdin can't be polled (regular file,
+        Windows console).
+        """
+        sel = selectors.DefaultSelector()
+        try:
+            fd = sys.stdin.fileno()
+            sel.register(fd, selectors.EVENT_READ)
+        except (AttributeError, ValueError, OSError, io.UnsupportedOperation):
+            sel.close()
+            yield from iter(self._open_stdin().readline, b"")
+            return
+        
+        pending = bytearray()
+        try:
+            while not self._stop_event.is_set():
+                if not sel.select(timeout=STDIN_POLL_SECONDS):
+                    continue
+                chunk = os.read(fd, STDIN_BUFFER_SIZE)
+                if not chunk:
+                    if pending:
+                        yield bytes(pending)
+                    return
+                pending += chunk
+                if b"\n" not in chunk:
+                    continue
+                *frames, rest = pending.split(b"\n")
+                pending = rest
+                yield from frames
+        finally:
+            sel.close()
+    
+    def stop(self) -> None:
+        """Ask run() to exit after the frame in progress."""
+        self._stop_event.set()
+    
+    def _install_signal_handlers(self) -> None:
+        try:
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        except (ValueError, AttributeError):
+            # Not on the main thread, or no SIGTERM on this platform
+            pass
+    
     def run(self) -> None:
         self.logger.log_info(f"Starting MCP server (workspace: {self.workspace_root})")
+        self._install_signal_handlers()
+        
+        # Read raw bytes and decode each frame once in the JSON parser, bypassing the
+        # locale-dependent TextIOWrapper on sys.stdin.
+        frames = self._iter_stdin_frames()
+        handle_request = self.handle_request
+        write_message = self._write_message
+        write_frame = self._write_frame
+        # Responses to pipelined tools/call requests may arrive out of order;
+        # JSON-RPC clients match them by id.
+        pool = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="local-search-tool")
+        respond = self._respond
         
         try:
-            for line in sys.stdin:
-                line = line.strip()
-                if not line:
+            for line in frames:
+                # JSON parsers accept surrounding whitespace, so frames go in unstripped;
+                # isspace() stops at the first "{" and allocates nothing.
+                if not line or line.isspace():
                     continue
                 
                 try:
-                    request = json.loads(line)
-                    response = self.handle_request(request)
+                    request = jsonio.loads(line)
+                    if type(request) is dict and request.get("id") is not None:
+                        method = request.get("method")
+                        # tools/list fast path: only the id varies, the result bytes are static
+                        if method == "tools/list":
+                            write_frame(b'{"jsonrpc":"2.0","id":' + jsonio.dumps_bytes(request["id"])
+                                        + b',"result":' + _TOOLS_LIST_RESULT_JSON + b'}\n')
+                            continue
+                        if method == "tools/call":
+                            pool.submit(respond, request)
+                            continue
+                    response = handle_request(request)
                     
                     if response is not None:
-                        print(json.dumps(response), flush=True)
-                except json.JSONDecodeError as e:
+                        write_message(response)
+                except (jsonio.JSONDecodeError, UnicodeDecodeError) as e:
                     self.logger.log_error(f"JSON decode error: {e}")
                     error_response = {
                         "jsonrpc": "2.0",
@@ -401,14 +610,21 @@ class LocalSearchMCPServer:
                             "message": "Parse error",
                         },
                     }
-                    print(json.dumps(error_response), flush=True)
+                    write_message(error_response)
         except KeyboardInterrupt:
-            self.logger.log_info("Shutting down...")
+            pass
         finally:
+            self.logger.log_info("Shutting down...")
+            # Finish in-flight tool calls while the DB is still open
+            pool.shutdown(wait=True)
             if self.indexer:
                 self.indexer.stop()
+                # Let an in-flight batch commit before the DB is closed under it
+                if self._indexer_thread is not None:
+                    self._indexer_thread.join(timeout=INDEXER_JOIN_TIMEOUT)
             if self.db:
                 self.db.close()
+            self.logger.close()
 
 
 def main() -> None:
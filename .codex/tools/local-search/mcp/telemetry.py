@@ -2,54 +2,159 @@
 """
 Telemetry and logging for Local Search MCP Server.
 """
+import os
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
-from datetime import datetime
 from typing import Optional
 
+# LOCAL_SEARCH_LOG_LEVEL: 0 = errors only, 1 = errors + info (default)
+LOG_LEVEL_ERROR = 0
+LOG_LEVEL_INFO = 1
+
+# Background writer: lines per writelines() batch and max seconds a line stays buffered
+LOG_BATCH_LINES = 64
+LOG_FLUSH_SECONDS = 0.5
+LOG_FILE_BUFFER = 1 << 16
+
+_CLOSE = object()
+
+
+def _env_log_level() -> int:
+    try:
+        return int(os.environ.get("LOCAL_SEARCH_LOG_LEVEL", str(LOG_LEVEL_INFO)))
+    except ValueError:
+        return LOG_LEVEL_INFO
+
 
 class TelemetryLogger:
-    """Handles logging and telemetry for MCP server."""
-    
+    """Handles logging and telemetry for MCP server.
+
+    File writes go through a queue drained by one daemon thread that keeps
+    the log file open, so request handlers never block on open/write/close.
+    """
+
     def __init__(self, log_dir: Optional[Path] = None):
         """
         Initialize telemetry logger.
-        
+
         Args:
             log_dir: Directory for log files. If None, uses global log dir.
         """
         self.log_dir = log_dir
-    
+        self.level = _env_log_level()
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        # (second, date-time prefix, UTC offset); recomputed only when the second changes
+        self._ts_cache = (-1, "", "")
+
     def log_error(self, message: str) -> None:
         """Log error message to stderr and file."""
         print(f"[local-search] ERROR: {message}", file=sys.stderr, flush=True)
         self._write_to_file(f"[ERROR] {message}")
-    
+
     def log_info(self, message: str) -> None:
         """Log info message to stderr and file."""
-        print(f"[local-search] INFO: {message}", file=sys.stderr, flush=True)
+        if self.level < LOG_LEVEL_INFO:
+            return
+        # stderr is line-buffered, so no explicit flush is needed here
+        print(f"[local-search] INFO: {message}", file=sys.stderr)
         self._write_to_file(f"[INFO] {message}")
-    
+
     def log_telemetry(self, message: str) -> None:
         """
         Log telemetry to file.
-        
+
         Args:
             message: Telemetry message to log
         """
         self._write_to_file(message)
 
+    def close(self, timeout: float = 2.0) -> None:
+        """Flush queued lines and stop the writer thread."""
+        writer = self._writer
+        if writer is None:
+            return
+        self._queue.put(_CLOSE)
+        writer.join(timeout=timeout)
+        self._writer = None
+
+    def _timestamp(self) -> str:
+        """Local ISO-8601 timestamp with microseconds and UTC offset."""
+        now = time.time()
+        sec = int(now)
+        cached_sec, prefix, tz = self._ts_cache
+        if sec != cached_sec:
+            lt = time.localtime(sec)
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", lt)
+            tz = time.strftime("%z", lt)
+            if len(tz) == 5:
+                tz = f"{tz[:3]}:{tz[3:]}"
+            # Single tuple assignment, so threads never see a torn prefix/offset pair
+            self._ts_cache = (sec, prefix, tz)
+        return f"{prefix}.{int((now - sec) * 1_000_000):06d}{tz}"
+
     def _write_to_file(self, message: str) -> None:
-        """Helper to write message with timestamp to log file."""
+        """Queue message with timestamp for the background log writer."""
         if not self.log_dir:
             return
-        
+
+        if self._writer is None:
+            self._start_writer()
+        self._queue.put(f"[{self._timestamp()}] {message}\n")
+
+    def _start_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(target=self._writer_loop, name="local-search-log", daemon=True)
+            self._writer.start()
+
+    def _writer_loop(self) -> None:
+        q = self._queue
         try:
             self.log_dir.mkdir(parents=True, exist_ok=True)
-            log_file = self.log_dir / "local-search.log"
-            
-            timestamp = datetime.now().astimezone().isoformat()
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}] {message}\n")
+            fh = open(self.log_dir / "local-search.log", "a", encoding="utf-8", buffering=LOG_FILE_BUFFER)
         except Exception as e:
             print(f"[local-search] ERROR: Failed to log to file: {e}", file=sys.stderr, flush=True)
+            # Stop queueing lines nobody will write; stderr output is unaffected
+            self.log_dir = None
+            while True:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    return
+
+        last_flush = time.monotonic()
+        with fh:
+            while True:
+                try:
+                    item = q.get(timeout=LOG_FLUSH_SECONDS)
+                except queue.Empty:
+                    # Idle: push buffered lines to disk
+                    fh.flush()
+                    last_flush = time.monotonic()
+                    continue
+
+                batch = []
+                while item is not _CLOSE:
+                    batch.append(item)
+                    if len(batch) >= LOG_BATCH_LINES:
+                        break
+                    try:
+                        item = q.get_nowait()
+                    except queue.Empty:
+                        break
+                try:
+                    fh.writelines(batch)
+                    # Under steady traffic the idle flush never fires
+                    if time.monotonic() - last_flush >= LOG_FLUSH_SECONDS:
+                        fh.flush()
+                        last_flush = time.monotonic()
+                except Exception as e:
+                    print(f"[local-search] ERROR: Failed to log to file: {e}", file=sys.stderr, flush=True)
+                if item is _CLOSE:
+                    return
@@ -7,6 +7,7 @@ Usage:
   # or
   python3 .codex/tools/local-search/mcp/test_server.py
 """
+import io
 import json
 import os
 import sys
@@ -95,6 +96,42 @@ def test_handle_request_tools_list():
         assert "tools" in response["result"]
 
 
+def test_run_tools_list_fast_path():
+    """Test run() emits the pre-encoded tools/list frame identical to handle_request."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        server = LocalSearchMCPServer(tmpdir)
+        
+        frames = b'{"jsonrpc":"2.0","id":"a1","method":"tools/list"}\n'
+        stdin = io.TextIOWrapper(io.BytesIO(frames))
+        stdout = io.StringIO()
+        with patch.object(sys, "stdin", stdin), patch.object(sys, "stdout", stdout):
+            server.run()
+        
+        response = json.loads(stdout.getvalue())
+        expected = json.loads(json.dumps(server.handle_request({"jsonrpc": "2.0", "id": "a1", "method": "tools/list"})))
+        assert response == expected
+
+
+def test_run_tools_call_on_worker():
+    """Test run() answers tool calls from the worker pool alongside inline requests."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        server = LocalSearchMCPServer(tmpdir)
+        
+        frames = (
+            b'{"jsonrpc":"2.0","id":1,"method":"tools/call","params":{"name":"status","arguments":{}}}\n'
+            b'{"jsonrpc":"2.0","id":2,"method":"ping"}\n'
+        )
+        stdin = io.TextIOWrapper(io.BytesIO(frames))
+        stdout = io.StringIO()
+        with patch.object(sys, "stdin", stdin), patch.object(sys, "stdout", stdout):
+            server.run()
+        
+        responses = {r["id"]: r for r in map(json.loads, stdout.getvalue().splitlines())}
+        assert set(responses) == {1, 2}
+        assert "index_ready" in json.loads(responses[1]["result"]["content"][0]["text"])
+        assert responses[2]["result"] == {}
+
+
 def test_handle_request_unknown_method():
     """Test error handling for unknown method."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -132,6 +169,21 @@ def test_handle_notification_no_response():
         assert response is None
 
 
+def test_handle_request_invalid_request():
+    """Test that a non-object frame gets Invalid Request instead of crashing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        server = LocalSearchMCPServer(tmpdir)
+        
+        response = server.handle_request([1, 2])
+        
+        assert response["id"] is None
+        assert response["error"]["code"] == -32600
+        
+        # Null params fall back to defaults
+        response = server.handle_request({"jsonrpc": "2.0", "id": 4, "method": "ping", "params": None})
+        assert response["result"] == {}
+
+
 def test_tool_status():
     """Test status tool execution."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -160,6 +212,82 @@ def test_tool_search_empty_query():
         assert result.get("isError") is True
 
 
+def test_tool_search_cache_expires():
+    """Test cached search payloads expire, so recency tiers follow the clock."""
+    import time
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        server = LocalSearchMCPServer(tmpdir)
+        server._ensure_initialized()
+        now = time.time()
+        # Just under a day old: 1.5x boost now, 1.3x two minutes from now
+        # Filler rows give the term a positive bm25 IDF
+        rows = [(f"repo1/f{i}.py", "repo1", int(now) - 86400 * 40, 10, "x = 1") for i in range(10)]
+        rows.append(("repo1/a.py", "repo1", int(now) - 86400 + 60, 10, "def needle(): pass"))
+        server.db.upsert_files(rows)
+        args = {"query": "needle", "recency_boost": True}
+        
+        first = server._tool_search(args)["content"][0]["text"]
+        assert server._tool_search(args)["content"][0]["text"] == first # served from cache
+        
+        mono = time.monotonic()
+        with patch("time.time", return_value=now + 120), patch("time.monotonic", return_value=mono + 120):
+            later = server._tool_search(args)["content"][0]["text"]
+        
+        score_first = json.loads(first)["results"][0]["score"]
+        score_later = json.loads(later)["results"][0]["score"]
+        assert score_later < score_first
+
+
+def test_telemetry_background_writer():
+    """Test queued log lines reach the file once the logger is closed."""
+    from telemetry import TelemetryLogger
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        logger = TelemetryLogger(Path(tmpdir))
+        for i in range(100):
+            logger.log_telemetry(f"tool=search n={i}")
+        logger.close()
+        
+        lines = (Path(tmpdir) / "local-search.log").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 100
+        assert lines[0].endswith("tool=search n=0")
+        assert lines[-1].endswith("tool=search n=99")
+        assert lines[0].startswith("[") and "T" in lines[0].split("]")[0]
+    
+    with tempfile.NamedTemporaryFile() as not_a_dir:
+        logger = TelemetryLogger(Path(not_a_dir.name))
+        logger.log_telemetry("lost")
+        logger.close()
+        assert logger.log_dir is None
+        logger.log_telemetry("dropped without queueing")
+        assert logger._queue.empty()
+
+
+def test_detect_workspace_marker_cache():
+    """Test .codex-root lookup is cached per cwd until clear_cache()."""
+    from workspace import WorkspaceManager
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.realpath(tmpdir)
+        sub = os.path.join(root, "a", "b")
+        os.makedirs(sub)
+        old_cwd = os.getcwd()
+        try:
+            os.chdir(sub)
+            with patch.dict(os.environ, {}, clear=False):
+                os.environ.pop("LOCAL_SEARCH_WORKSPACE_ROOT", None)
+                WorkspaceManager.clear_cache()
+                assert WorkspaceManager.detect_workspace() == sub
+                Path(root, ".codex-root").touch()
+                assert WorkspaceManager.detect_workspace() == sub # cached
+                WorkspaceManager.clear_cache()
+                assert WorkspaceManager.detect_workspace() == root
+        finally:
+            os.chdir(old_cwd)
+            WorkspaceManager.clear_cache()
+
+
 def run_tests():
     """Run all tests without pytest."""
     import traceback
@@ -169,10 +297,16 @@ def run_tests():
         test_tools_list,
         test_handle_request_initialize,
         test_handle_request_tools_list,
+        test_run_tools_list_fast_path,
+        test_run_tools_call_on_worker,
         test_handle_request_unknown_method,
         test_handle_notification_no_response,
+        test_handle_request_invalid_request,
         test_tool_status,
         test_tool_search_empty_query,
+        test_tool_search_cache_expires,
+        test_telemetry_background_writer,
+        test_detect_workspace_marker_cache,
     ]
     
     passed = 0
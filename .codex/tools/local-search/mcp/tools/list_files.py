@@ -2,11 +2,11 @@
 """
 List files tool for Local Search MCP Server.
 """
-import json
 import time
 from typing import Any, Dict
 from db import LocalSearchDB
 from telemetry import TelemetryLogger
+from jsonio import dumps_text
 
 
 def execute_list_files(args: Dict[str, Any], db: LocalSearchDB, logger: TelemetryLogger) -> Dict[str, Any]:
@@ -19,6 +19,7 @@ def execute_list_files(args: Dict[str, Any], db: LocalSearchDB, logger: Telemetr
         include_hidden=bool(args.get("include_hidden", False)),
         limit=int(args.get("limit", 100)),
         offset=int(args.get("offset", 0)),
+        cursor=args.get("cursor") or None,
     )
     
     output = {
@@ -26,7 +27,7 @@ def execute_list_files(args: Dict[str, Any], db: LocalSearchDB, logger: Telemetr
         "meta": meta,
     }
     
-    json_output = json.dumps(output, indent=2, ensure_ascii=False)
+    json_output = dumps_text(output)
     
     # Telemetry: Log list_files stats
     latency_ms = int((time.time() - start_ts) * 1000)
@@ -2,10 +2,10 @@
 """
 Repo candidates tool for Local Search MCP Server.
 """
-import json
 from typing import Any, Dict
 from db import LocalSearchDB
 from telemetry import TelemetryLogger
+from jsonio import dumps_text
 
 
 def execute_repo_candidates(args: Dict[str, Any], db: LocalSearchDB, logger: TelemetryLogger = None) -> Dict[str, Any]:
@@ -41,5 +41,5 @@ def execute_repo_candidates(args: Dict[str, Any], db: LocalSearchDB, logger: Tel
         logger.log_telemetry(f"tool=repo_candidates query='{query}' results={len(candidates)}")
 
     return {
-        "content": [{"type": "text", "text": json.dumps(output, indent=2, ensure_ascii=False)}],
+        "content": [{"type": "text", "text": dumps_text(output)}],
     }
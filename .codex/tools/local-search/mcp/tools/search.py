@@ -2,15 +2,28 @@
 """
 Search tool for Local Search MCP Server.
 """
-import json
+import heapq
 import time
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
 from db import LocalSearchDB, SearchOptions
 from telemetry import TelemetryLogger
+from jsonio import dumps_text
 
+# Rendered payloads kept per server for repeated identical searches
+SEARCH_CACHE_SIZE = 128
+# Used when the DB doesn't expose its own search_v2 TTL
+SEARCH_CACHE_TTL = 60.0
 
-def execute_search(args: Dict[str, Any], db: LocalSearchDB, logger: TelemetryLogger) -> Dict[str, Any]:
-    """Execute enhanced search tool (v2.5.0)."""
+
+def execute_search(args: Dict[str, Any], db: LocalSearchDB, logger: TelemetryLogger,
+                   cache: Optional["OrderedDict[tuple, tuple[float, str]]"] = None) -> Dict[str, Any]:
+    """Execute enhanced search tool (v2.5.0).
+
+    With a cache, identical searches against an unchanged index return the
+    previously rendered JSON without touching the DB, for at most the DB's
+    search TTL (scores such as the recency boost depend on the current time).
+    """
     start_ts = time.time()
     query = args.get("query", "")
     
@@ -24,22 +37,54 @@ def execute_search(args: Dict[str, Any], db: LocalSearchDB, logger: TelemetryLog
     if repo == "workspace":
         repo = None
     
-    file_types = list(args.get("file_types", []))
+    # Pass caller lists through as-is; only copy when "docs" has to extend them
+    file_types = args.get("file_types") or ()
     search_type = args.get("type")
     if search_type == "docs":
         doc_exts = ["md", "txt", "pdf", "docx", "rst", "pdf"]
+        file_types = list(file_types)
         file_types.extend([e for e in doc_exts if e not in file_types])
     
     limit = min(int(args.get("limit", 10)), 50)
     offset = max(int(args.get("offset", 0)), 0)
+    # Tuple form is what the cache key and the DB's filter LRU hash on
+    exclude_patterns = tuple(args.get("exclude_patterns") or ())
+
+    # db.cache_version moves on every index write, so entries never outlive the data;
+    # the TTL bounds how stale time-dependent scores (recency tiers) can get.
+    cache_key: Optional[tuple] = None
+    cache_now = time.monotonic()
+    if cache is not None and db:
+        cache_key = (
+            db.cache_version, query, repo, limit, offset, int(args.get("context_lines", 5)),
+            tuple(file_types), args.get("path_pattern"), exclude_patterns,
+            bool(args.get("recency_boost", False)), bool(args.get("use_regex", False)),
+            bool(args.get("case_sensitive", False)),
+        )
+        try:
+            cached = cache.get(cache_key)
+        except TypeError:
+            # Unhashable filter values; just don't cache this call
+            cache_key, cached = None, None
+        if cached is not None and cache_now - cached[0] >= getattr(db, "_search_cache_ttl", SEARCH_CACHE_TTL):
+            cached = None
+        if cached is not None:
+            # Concurrent tool workers share the cache; the entry may be evicted meanwhile
+            try:
+                cache.move_to_end(cache_key)
+            except KeyError:
+                pass
+            latency_ms = int((time.time() - start_ts) * 1000)
+            logger.log_telemetry(f"tool=search query='{query}' cache=hit latency={latency_ms}ms")
+            return {
+                "content": [{"type": "text", "text": cached[1]}],
+            }
 
     # Determine total_mode based on scale (v2.5.1)
     total_mode = "exact"
     if db:
-        status = db.get_index_status()
-        total_files = status.get("total_files", 0)
-        repo_stats = db.get_repo_stats()
-        total_repos = len(repo_stats)
+        # Cached per scan; no COUNT(*) / GROUP BY on the request path
+        total_files, total_repos = db.get_index_scale()
         
         if total_repos > 50 or total_files > 150000:
             total_mode = "approx"
@@ -55,7 +100,7 @@ def execute_search(args: Dict[str, Any], db: LocalSearchDB, logger: TelemetryLog
         snippet_lines=int(args.get("context_lines", 5)),
         file_types=file_types,
         path_pattern=args.get("path_pattern"),
-        exclude_patterns=args.get("exclude_patterns", []),
+        exclude_patterns=exclude_patterns,
         recency_boost=bool(args.get("recency_boost", False)),
         use_regex=bool(args.get("use_regex", False)),
         case_sensitive=bool(args.get("case_sensitive", False)),
@@ -64,16 +109,20 @@ def execute_search(args: Dict[str, Any], db: LocalSearchDB, logger: TelemetryLog
     
     hits, db_meta = db.search_v2(opts)
     
+    # Build result dicts and per-repo grouping in a single pass over hits
     results: List[Dict[str, Any]] = []
+    repo_groups: Dict[str, Dict[str, Any]] = {}
+    snippet_chars = 0
+    append = results.append
     for hit in hits:
-        # UX: Remap __root__ to (root)
-        repo_display = hit.repo if hit.repo != "__root__" else "(root)"
-        
+        hit_repo = hit.repo
+        score = hit.score
         result = {
-            "repo": hit.repo,
-            "repo_display": repo_display,
+            "repo": hit_repo,
+            # UX: Remap __root__ to (root)
+            "repo_display": hit_repo if hit_repo != "__root__" else "(root)",
             "path": hit.path,
-            "score": hit.score,
+            "score": score,
             "reason": hit.hit_reason,
             "snippet": hit.snippet,
         }
@@ -85,19 +134,24 @@ def execute_search(args: Dict[str, Any], db: LocalSearchDB, logger: TelemetryLog
             result["match_count"] = hit.match_count
         if hit.file_type:
             result["file_type"] = hit.file_type
-        results.append(result)
-    
-    # Result Grouping
-    repo_groups = {}
-    for r in results:
-        repo = r["repo"]
-        if repo not in repo_groups:
-            repo_groups[repo] = {"count": 0, "top_score": 0.0}
-        repo_groups[repo]["count"] += 1
-        repo_groups[repo]["top_score"] = max(repo_groups[repo]["top_score"], r["score"])
-    
-    # Sort repos by top_score
-    top_repos = sorted(repo_groups.keys(), key=lambda k: repo_groups[k]["top_score"], reverse=True)[:2]
+        append(result)
+        snippet_chars += len(hit.snippet)
+        
+        # Result Grouping
+        group = repo_groups.get(hit_repo)
+        if group is None:
+            repo_groups[hit_repo] = {"count": 1, "top_score": max(0.0, score)}
+        else:
+            group["count"] += 1
+            if score > group["top_score"]:
+                group["top_score"] = score
+    
+    # Two best repos by top_score; same order as sorted(...)[:2] without sorting every group.
+    # No hits or a single repo (always the case with a repo filter) needs no ranking.
+    if len(repo_groups) <= 1:
+        top_repos = list(repo_groups)
+    else:
+        top_repos = heapq.nlargest(2, repo_groups, key=lambda k: repo_groups[k]["top_score"])
     
     scope = f"repo:{opts.repo}" if opts.repo else "workspace"
     
@@ -105,10 +159,8 @@ def execute_search(args: Dict[str, Any], db: LocalSearchDB, logger: TelemetryLog
     total = db_meta.get("total", len(results))
     total_mode = db_meta.get("total_mode", "exact")
     
-    # Even if SQL total is exact, exclude_patterns might reduce it further
+    # Filters (incl. exclude_patterns) run in SQL, so an exact total stays exact
     is_exact_total = (total_mode == "exact")
-    if opts.exclude_patterns and total > 0:
-         is_exact_total = False
     
     has_more = total > (offset + limit)
     
@@ -161,7 +213,7 @@ def execute_search(args: Dict[str, Any], db: LocalSearchDB, logger: TelemetryLog
         if opts.repo: active_filters.append(f"repo='{opts.repo}'")
         if opts.file_types: active_filters.append(f"file_types={opts.file_types}")
         if opts.path_pattern: active_filters.append(f"path_pattern='{opts.path_pattern}'")
-        if opts.exclude_patterns: active_filters.append(f"exclude_patterns={opts.exclude_patterns}")
+        if opts.exclude_patterns: active_filters.append(f"exclude_patterns={list(opts.exclude_patterns)}")
         
         if active_filters:
             reason = f"No matches found with filters: {', '.join(active_filters)}"
@@ -181,10 +233,22 @@ def execute_search(args: Dict[str, Any], db: LocalSearchDB, logger: TelemetryLog
     
     # Telemetry: Log search stats
     latency_ms = int((time.time() - start_ts) * 1000)
-    snippet_chars = sum(len(r.get("snippet", "")) for r in results)
     
     logger.log_telemetry(f"tool=search query='{opts.query}' results={len(results)} snippet_chars={snippet_chars} latency={latency_ms}ms")
 
+    text = dumps_text(output)
+    if cache_key is not None:
+        cache[cache_key] = (cache_now, text)
+        try:
+            cache.move_to_end(cache_key)
+        except KeyError:
+            pass
+        if len(cache) > SEARCH_CACHE_SIZE:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                pass
+
     return {
-        "content": [{"type": "text", "text": json.dumps(output, indent=2, ensure_ascii=False)}],
+        "content": [{"type": "text", "text": text}],
     }
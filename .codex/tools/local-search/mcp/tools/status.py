@@ -2,24 +2,17 @@
 """
 Status tool for Local Search MCP Server.
 """
-import json
 from typing import Any, Dict, Optional
 from db import LocalSearchDB
 from indexer import Indexer
 from config import Config
 from telemetry import TelemetryLogger
+from jsonio import dumps_text
 
 
-def execute_status(args: Dict[str, Any], indexer: Optional[Indexer], db: Optional[LocalSearchDB], cfg: Optional[Config], workspace_root: str, server_version: str, logger: Optional[TelemetryLogger] = None) -> Dict[str, Any]:
-    """Execute status tool."""
-    details = bool(args.get("details", False))
-    
-    status = {
-        "index_ready": indexer.status.index_ready if indexer else False,
-        "last_scan_ts": indexer.status.last_scan_ts if indexer else 0,
-        "scanned_files": indexer.status.scanned_files if indexer else 0,
-        "indexed_files": indexer.status.indexed_files if indexer else 0,
-        "errors": indexer.status.errors if indexer else 0,
+def build_status_static(db: Optional[LocalSearchDB], cfg: Optional[Config], workspace_root: str, server_version: str) -> Dict[str, Any]:
+    """Status fields that only change on (re)initialization; build once and pass to execute_status."""
+    static: Dict[str, Any] = {
         "fts_enabled": db.fts_enabled if db else False,
         "workspace_root": workspace_root,
         "server_version": server_version,
@@ -27,12 +20,32 @@ def execute_status(args: Dict[str, Any], indexer: Optional[Indexer], db: Optiona
     
     # v2.5.2: Add config info for debugging
     if cfg:
-        status["config"] = {
+        static["config"] = {
             "include_ext": cfg.include_ext,
             "exclude_dirs": cfg.exclude_dirs,
             "exclude_globs": getattr(cfg, "exclude_globs", []),
             "max_file_bytes": cfg.max_file_bytes,
         }
+    return static
+
+
+def execute_status(args: Dict[str, Any], indexer: Optional[Indexer], db: Optional[LocalSearchDB], cfg: Optional[Config], workspace_root: str, server_version: str, logger: Optional[TelemetryLogger] = None,
+                   static: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Execute status tool."""
+    details = bool(args.get("details", False))
+    
+    if static is None:
+        static = build_status_static(db, cfg, workspace_root, server_version)
+    
+    idx_status = indexer.status if indexer else None
+    status = {
+        "index_ready": idx_status.index_ready if idx_status else False,
+        "last_scan_ts": idx_status.last_scan_ts if idx_status else 0,
+        "scanned_files": idx_status.scanned_files if idx_status else 0,
+        "indexed_files": idx_status.indexed_files if idx_status else 0,
+        "errors": idx_status.errors if idx_status else 0,
+    }
+    status.update(static)
     
     if details and db:
         status["repo_stats"] = db.get_repo_stats()
@@ -41,5 +54,5 @@ def execute_status(args: Dict[str, Any], indexer: Optional[Indexer], db: Optiona
         logger.log_telemetry(f"tool=status details={details} scanned={status['scanned_files']} indexed={status['indexed_files']}")
     
     return {
-        "content": [{"type": "text", "text": json.dumps(status, indent=2)}],
+        "content": [{"type": "text", "text": dumps_text(status)}],
     }
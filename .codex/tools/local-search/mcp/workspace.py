@@ -4,6 +4,7 @@ Workspace management for Local Search MCP Server.
 Handles workspace detection and global path resolution.
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -41,14 +42,30 @@ class WorkspaceManager:
                 return str(Path.cwd())
             return workspace_root
         
-        # 3. Search for .codex-root marker
-        cwd = Path.cwd()
-        for parent in [cwd] + list(cwd.parents):
-            if (parent / ".codex-root").exists():
-                return str(parent)
-        
-        # 4. Fallback to cwd
-        return str(cwd)
+        # 3./4. .codex-root marker from cwd upward, else cwd (cached per cwd)
+        return WorkspaceManager._find_marker_root(os.getcwd())
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _find_marker_root(cwd: str) -> str:
+        """Nearest ancestor of cwd holding .codex-root, or cwd itself.
+
+        String walk with one lstat per level; cached, since the marker is only
+        created by install. Call clear_cache() if it moves.
+        """
+        current = cwd
+        while True:
+            if os.path.lexists(os.path.join(current, ".codex-root")):
+                return current
+            parent = os.path.dirname(current)
+            if parent == current:
+                return cwd
+            current = parent
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget cached .codex-root lookups."""
+        WorkspaceManager._find_marker_root.cache_clear()
     
     @staticmethod
     def get_global_data_dir() -> Path:
@@ -0,0 +1,50 @@
+
+import sys
+from pathlib import Path
+
+# Setup paths
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / ".codex" / "tools" / "local-search" / "app"))
+
+from indexer import _redact
+
+def test_redact_assignments():
+    text = "password = hunter2\n  db.password=s3cr3t\napi_key: abc123"
+    assert _redact(text) == "password = ***\n  db.password=***\napi_key: ***"
+    print("✓ Line assignments redacted")
+
+def test_redact_json_and_bearer():
+    text = '{\n  "token": "abc",\n  "name": "x"\n}\nAuthorization: Bearer eyJ.abc\ncurl -H "bearer xyz=="'
+    assert _redact(text) == '{\n  "token": "***",\n  "name": "x"\n}\nAuthorization: Bearer ***\ncurl -H "bearer ***"'
+    print("✓ JSON values and bearer tokens redacted")
+
+def test_redact_leaves_code_alone():
+    text = "def get_token(self):\n        return self._token\n"
+    assert _redact(text) == text
+    print("✓ Code without assignments left unchanged")
+
+def test_redact_prefilter_non_ascii():
+    # IGNORECASE folds U+0131 (dotless i) to "i"; the ASCII keyword prefilter must not skip it
+    text = "pr\u0131vate_key = abc"
+    assert _redact(text) == "pr\u0131vate_key = ***"
+    print("✓ Non-ASCII keyword variants still redacted")
+
+def test_redact_rules_apply_in_sequence():
+    # "Bearer\s+" can run across the newline into the next line's key; the
+    # assignment rule must already have masked that value (no single-pass alternation)
+    text = "curl -H Bearer \ntoken = hunter2"
+    assert "hunter2" not in _redact(text)
+    print("✓ Later lines redacted even when a Bearer match spans the newline")
+
+if __name__ == "__main__":
+    try:
+        test_redact_assignments()
+        test_redact_json_and_bearer()
+        test_redact_leaves_code_alone()
+        test_redact_prefilter_non_ascii()
+        test_redact_rules_apply_in_sequence()
+        print("\nAll redaction tests passed!")
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
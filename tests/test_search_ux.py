@@ -98,5 +98,18 @@ class TestSearchUX(unittest.TestCase):
         self.assertIn("Try a broader query or remove filters.", hints)
         print("✓ Generic hints for simple no-match")
 
+    def test_search_result_cache(self):
+        """Verify repeated searches reuse the rendered payload until the index changes."""
+        args = {"query": "main"}
+        first = self.server._tool_search(args)["content"][0]["text"]
+        second = self.server._tool_search(args)["content"][0]["text"]
+        self.assertIs(first, second)
+        print("✓ Repeated search served from result cache")
+        
+        self.db.upsert_files([("src/other.py", "repo1", 1001, 50, "main = 1")])
+        third = json.loads(self.server._tool_search(args)["content"][0]["text"])
+        self.assertIn("src/other.py", [r["path"] for r in third["results"]])
+        print("✓ Result cache invalidated by index writes")
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,6 @@
 
 import os
+import sqlite3
 import sys
 import tempfile
 from pathlib import Path
@@ -10,20 +11,38 @@ sys.path.insert(0, str(PROJECT_ROOT / ".codex" / "tools" / "local-search" / "app
 
 from db import LocalSearchDB, SearchOptions
 
+_TEMPLATE_DIR = None
+
+def _template_db_path():
+    """Build the fixture index once per run; tests get their own copy of it."""
+    global _TEMPLATE_DIR
+    if _TEMPLATE_DIR is None:
+        _TEMPLATE_DIR = tempfile.TemporaryDirectory()
+        db = LocalSearchDB(os.path.join(_TEMPLATE_DIR.name, "template.db"))
+        # Add dummy data
+        files = [
+            ("src/main.py", "repo1", 1000, 100, "print('hello')"),
+            ("src/utils.py", "repo1", 1001, 200, "def util(): pass"),
+            ("tests/test_main.py", "repo1", 1002, 150, "def test_hello(): pass"),
+            ("docs/index.md", "repo1", 1003, 500, "# Welcome"),
+            ("README.md", "__root__", 1004, 300, "Project info"),
+            ("package.json", "repo2", 1005, 400, '{"name": "test"}'),
+            ("src/app.ts", "repo2", 1006, 600, "console.log('hi')"),
+        ]
+        db.upsert_files(files)
+        db.close()
+    return os.path.join(_TEMPLATE_DIR.name, "template.db")
+
 def setup_test_db(db_path):
-    db = LocalSearchDB(db_path)
-    # Add dummy data
-    files = [
-        ("src/main.py", "repo1", 1000, 100, "print('hello')"),
-        ("src/utils.py", "repo1", 1001, 200, "def util(): pass"),
-        ("tests/test_main.py", "repo1", 1002, 150, "def test_hello(): pass"),
-        ("docs/index.md", "repo1", 1003, 500, "# Welcome"),
-        ("README.md", "__root__", 1004, 300, "Project info"),
-        ("package.json", "repo2", 1005, 400, '{"name": "test"}'),
-        ("src/app.ts", "repo2", 1006, 600, "console.log('hi')"),
-    ]
-    db.upsert_files(files)
-    return db
+    # Page-level copy of the prebuilt index instead of re-creating schema + rows
+    src = sqlite3.connect(_template_db_path())
+    dst = sqlite3.connect(db_path)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+    return LocalSearchDB(db_path)
 
 def test_file_type_filter():
     with tempfile.NamedTemporaryFile() as tmp:
@@ -63,6 +82,22 @@ def test_path_pattern_filter():
         print("✓ Path pattern filter (**/test*) passed")
         db.close()
 
+def test_exclude_patterns_filter():
+    with tempfile.NamedTemporaryFile() as tmp:
+        db = setup_test_db(tmp.name)
+        
+        opts = SearchOptions(query="def", exclude_patterns=["tests"])
+        hits, meta = db.search_v2(opts)
+        assert [h.path for h in hits] == ["src/utils.py"]
+        assert meta["total"] == 1 # Excludes are applied in SQL, so total is exact
+        print("✓ Exclude patterns filter (tests) passed")
+        
+        opts = SearchOptions(query="def", exclude_patterns=["src/*.py"])
+        hits, meta = db.search_v2(opts)
+        assert [h.path for h in hits] == ["tests/test_main.py"]
+        print("✓ Exclude patterns filter (glob) passed")
+        db.close()
+
 def test_pagination():
     with tempfile.NamedTemporaryFile() as tmp:
         db = setup_test_db(tmp.name)
@@ -91,14 +126,134 @@ def test_total_mode():
         assert meta["total"] == 2
         assert meta["total_mode"] == "exact"
         print("✓ Total mode (exact) passed")
+        
+        opts = SearchOptions(query="def", total_mode="approx")
+        hits, meta = db.search_v2(opts)
+        assert meta["total"] == 2 # Candidate fetch not saturated, so still exact
+        assert meta["total_mode"] == "approx"
+        print("✓ Total mode (approx) passed")
+        db.close()
+
+def test_search_cache_invalidation():
+    with tempfile.NamedTemporaryFile() as tmp:
+        db = setup_test_db(tmp.name)
+        
+        opts = SearchOptions(query="def")
+        hits1, meta1 = db.search_v2(opts)
+        hits2, meta2 = db.search_v2(opts)
+        assert [h.path for h in hits1] == [h.path for h in hits2]
+        assert meta1 == meta2
+        print("✓ Repeated search served consistently from cache")
+        
+        # A write must invalidate cached results
+        db.upsert_files([("src/new.py", "repo1", 1007, 50, "def added(): pass")])
+        hits3, meta3 = db.search_v2(opts)
+        assert meta3["total"] == 3
+        assert "src/new.py" in [h.path for h in hits3]
+        print("✓ Search cache invalidated on upsert")
+        db.close()
+
+def test_repo_candidates():
+    with tempfile.NamedTemporaryFile() as tmp:
+        db = setup_test_db(tmp.name)
+        
+        cands = db.repo_candidates("def")
+        assert [c["repo"] for c in cands] == ["repo1"]
+        assert cands[0]["score"] == 2
+        assert ">>>def<<<" in cands[0]["evidence"]
+        print("✓ Repo candidates with batched evidence passed")
+        
+        cands[0]["reason"] = "mutated by caller"
+        assert "reason" not in db.repo_candidates("def")[0]
+        db.upsert_files([("lib/a.py", "repo2", 1009, 10, "def a(): pass")])
+        assert sorted(c["repo"] for c in db.repo_candidates("def")) == ["repo1", "repo2"]
+        print("✓ Repo candidates cache isolated and invalidated on upsert")
+        db.close()
+
+def test_list_files_cursor():
+    with tempfile.NamedTemporaryFile() as tmp:
+        db = setup_test_db(tmp.name)
+        
+        files, meta = db.list_files(limit=100)
+        all_paths = [f["path"] for f in files]
+        assert "next_cursor" not in meta
+        
+        paged = []
+        cursor = None
+        while True:
+            files, meta = db.list_files(limit=2, cursor=cursor)
+            paged.extend(f["path"] for f in files)
+            cursor = meta.get("next_cursor")
+            if not cursor:
+                break
+        assert paged == all_paths
+        assert meta["total"] == len(all_paths)
+        print("✓ list_files keyset cursor pagination passed")
+        
+        try:
+            db.list_files(cursor="not-a-cursor")
+            assert False, "invalid cursor accepted"
+        except ValueError:
+            pass
+        print("✓ list_files rejects invalid cursor")
+        db.close()
+
+def test_index_scale_cache():
+    with tempfile.NamedTemporaryFile() as tmp:
+        db = setup_test_db(tmp.name)
+        
+        assert db.get_index_scale() == (7, 3)
+        db.upsert_files([("src/more.py", "repo3", 1008, 10, "x = 1")])
+        assert db.get_index_scale() == (7, 3) # Served from cache until the scan ends
+        db.clear_stats_cache()
+        assert db.get_index_scale() == (8, 4)
+        print("✓ Index scale cached until stats cache is cleared")
+        db.close()
+
+def test_get_all_file_meta():
+    with tempfile.NamedTemporaryFile() as tmp:
+        db = setup_test_db(tmp.name)
+        
+        meta = db.get_all_file_meta()
+        assert len(meta) == 7
+        assert meta["src/utils.py"] == (1001, 200, None)
+        assert meta["src/utils.py"] == db.get_file_meta("src/utils.py")
+        assert "missing.py" not in meta
+        print("✓ All file meta loaded in one query")
+        db.close()
+
+def test_content_hash_and_touch():
+    with tempfile.NamedTemporaryFile() as tmp:
+        db = setup_test_db(tmp.name)
+        
+        assert db.get_file_meta("src/main.py")[2] is None # 5-tuple rows store no hash
+        db.upsert_files([("src/main.py", "repo1", 1010, 15, "print('goodbye')", b"h1")])
+        assert db.get_all_file_meta()["src/main.py"] == (1010, 15, b"h1")
+        hits, _ = db.search_v2(SearchOptions(query="goodbye"))
+        assert [h.path for h in hits] == ["src/main.py"]
+        
+        version = db.cache_version
+        assert db.touch_files([("src/main.py", 2000, 15)]) == 1
+        assert db.cache_version > version
+        assert db.get_file_meta("src/main.py") == (2000, 15, b"h1")
+        hits, _ = db.search_v2(SearchOptions(query="goodbye"))
+        assert [h.path for h in hits] == ["src/main.py"] # FTS row untouched
+        print("✓ Content hash stored; touch_files updates stat only")
         db.close()
 
 if __name__ == "__main__":
     try:
         test_file_type_filter()
         test_path_pattern_filter()
+        test_exclude_patterns_filter()
         test_pagination()
         test_total_mode()
+        test_search_cache_invalidation()
+        test_repo_candidates()
+        test_list_files_cursor()
+        test_index_scale_cache()
+        test_get_all_file_meta()
+        test_content_hash_and_touch()
         print("\nAll Search v2 tests passed!")
     except Exception as e:
         import traceback